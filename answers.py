@@ -0,0 +1,77 @@
+"""Answers for the screening questions asked in Easy Apply forms."""
+import logging
+import os
+import re
+import threading
+
+import yaml
+
+log = logging.getLogger(__name__)
+
+# Rules used when config.yaml has none of its own; earlier rules win.
+DEFAULT_RULES = [
+	{'pattern': r"Are you.*authorized|Have you.*education", 'answer': "Yes"},
+	{'pattern': r"require.*sponsorship", 'answer': "No"},
+	{'pattern': r"(You have|Have you).*Bachelor's", 'answer': "Yes"},
+	{'pattern': r"(You have|Have you).*Master's", 'answer': "Yes"},
+	{'pattern': r"How many years.*experience", 'answer': 10},
+	{'pattern': r"Do you.*speak.*English", 'answer': "Yes"},
+	{'pattern': r"Do you.*speak", 'answer': "No"},
+]
+
+
+def normalize(question):
+	return " ".join(question.split())
+
+
+def format_answer(answer):
+	# YAML reads unquoted yes/no as booleans
+	if answer is True:
+		return "Yes"
+	if answer is False:
+		return "No"
+	return None if answer is None else str(answer)
+
+
+class AnswerBook:
+	"""Resolve a question to an answer from a cache of known questions, then from rules.
+
+	All rule patterns are compiled into one regex whose alternatives are tried
+	in order, so each question is matched with a single pass. Questions nobody
+	could answer are added to the answers file with an empty answer, ready to
+	be filled in by hand and picked up on the next run.
+	"""
+
+	def __init__(self, rules=None, filename='answers.yaml'):
+		self.filename = filename
+		self.lock = threading.Lock()
+		self.rules = list(rules or []) + DEFAULT_RULES
+		self.matcher = re.compile("|".join(
+			f"(?=.*?(?:{rule['pattern']}))(?P<rule{i}>)" for i, rule in enumerate(self.rules)),
+			re.IGNORECASE | re.DOTALL)
+		self.known = {}
+		if filename and os.path.isfile(filename):
+			with open(filename, encoding='utf-8') as f:
+				self.known = {normalize(q): a for q, a in (yaml.safe_load(f) or {}).items()}
+
+	def answer(self, question):
+		"""Return the answer as a string ("Yes", "No", a number or free text) or None."""
+		question = normalize(question)
+		with self.lock:
+			answer = format_answer(self.known.get(question))
+			if answer is not None:
+				return answer
+			match = self.matcher.match(question)
+			if match:
+				answer = format_answer(self.rules[int(match.lastgroup[4:])]['answer'])
+			if answer is None and question not in self.known:
+				self.known[question] = None
+				self.save()
+				log.warning("Added unanswered question to %s: %s", self.filename, question)
+			return answer
+
+	def save(self):
+		if not self.filename:
+			return
+		with open(self.filename, 'w', encoding='utf-8') as f:
+			yaml.safe_dump(self.known, f, allow_unicode=True, default_flow_style=False)
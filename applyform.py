@@ -0,0 +1,202 @@
+"""Read the state of the Easy Apply modal in one WebDriver call."""
+import time
+
+# Returns which buttons are visible, error messages, question groups that
+# still have no answer, whether a file upload is offered, and the progress bar.
+STATE_SCRIPT = """
+function visible(el) { return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)); }
+function find(root, selector) { return Array.from(root.querySelectorAll(selector)).filter(visible); }
+var dialog = find(document, 'div[role="dialog"], .jobs-easy-apply-modal')[0];
+if (!dialog) {
+	return {state: 'closed', buttons: {}, errors: [], unanswered: [], upload: false, progress: null, heading: null};
+}
+function button(label) { return find(document, 'button[aria-label="' + label + '"]').length > 0; }
+var buttons = {
+	next: button('Continue to next step'),
+	review: button('Review your application'),
+	submit: button('Submit application'),
+	dismiss: button('Dismiss')
+};
+var errors = find(dialog, '[data-test-form-element-error-message="true"]')
+	.map(function (el) { return el.innerText.trim(); })
+	.filter(function (text) { return text; });
+var unanswered = find(dialog, '.jobs-easy-apply-form-section__grouping').filter(function (group) {
+	var radios = group.querySelectorAll('input[type="radio"]');
+	if (radios.length) {
+		return !Array.from(radios).some(function (radio) { return radio.checked; });
+	}
+	return Array.from(group.querySelectorAll('input[type="text"], input:not([type]), textarea, select')).some(function (field) {
+		return !field.value || /^Select an option$/i.test(field.value);
+	});
+}).map(function (group) { return group.innerText.trim().split('\\n')[0]; });
+var upload = find(dialog, 'label[aria-label="DOC, DOCX, PDF formats only (2 MB)."]').length > 0 ||
+	dialog.querySelector('input[type="file"]') !== null;
+var progress = dialog.querySelector('progress, [role="progressbar"]');
+var heading = find(dialog, 'h3, h2')[0];
+var state = errors.length ? 'error'
+	: buttons.submit ? 'submit'
+	: buttons.review ? 'review'
+	: buttons.next ? 'next'
+	: buttons.dismiss ? 'done'
+	: 'unknown';
+return {
+	state: state,
+	buttons: buttons,
+	errors: errors,
+	unanswered: unanswered,
+	upload: upload,
+	progress: progress ? String(progress.value || progress.getAttribute('aria-valuenow')) : null,
+	heading: heading ? heading.innerText.trim() : null
+};
+"""
+
+BUTTON_LABELS = {
+	'next': "Continue to next step",
+	'review': "Review your application",
+	'submit': "Submit application",
+	'done': "Dismiss",
+}
+
+
+def read_state(browser):
+	return browser.execute_script(STATE_SCRIPT)
+
+
+def signature(form):
+	"""What has to change for a step to count as progress."""
+	return (form['state'], form['progress'], form.get('heading'), tuple(form['errors']), len(form['unanswered']),
+			tuple(sorted(key for key, shown in form['buttons'].items() if shown)))
+
+
+def step_key(form):
+	"""Which step the modal is on; the progress bar alone is missing from some forms."""
+	return (form['progress'], form.get('heading'), tuple(form['unanswered']))
+
+
+def wait_for_change(browser, previous, timeout=5, poll=0.25):
+	"""Poll the modal until its signature differs from `previous`; returns the last state read."""
+	deadline = time.time() + timeout
+	while True:
+		form = read_state(browser)
+		if signature(form) != signature(previous) or time.time() >= deadline:
+			return form
+		time.sleep(poll)
+
+
+# Closes the modal; LinkedIn then asks whether to discard or save the application.
+DISMISS_SCRIPT = """
+var button = document.querySelector('button[aria-label="Dismiss"]');
+if (button) { button.click(); }
+return !!button;
+"""
+
+DISCARD_SCRIPT = """
+var button = document.querySelector('button[data-control-name="discard_application_confirm_btn"]') ||
+	Array.from(document.querySelectorAll('div[role="alertdialog"] button, div[role="dialog"] button'))
+		.filter(function (el) { return /^\\s*Discard\\s*$/i.test(el.innerText); })[0];
+if (button) { button.click(); }
+return !!button;
+"""
+
+
+def dismiss(browser, timeout=2, poll=0.25):
+	"""Close the Easy Apply modal, discarding the application; returns False if none was open."""
+	if not browser.execute_script(DISMISS_SCRIPT):
+		return False
+	deadline = time.time() + timeout
+	while not browser.execute_script(DISCARD_SCRIPT) and time.time() < deadline:
+		time.sleep(poll)
+	return True
+
+
+# Every question in the modal step: its kind, text, options and whether it already has a value.
+# Groups are tagged so FILL_SCRIPT can find them again.
+FIELDS_SCRIPT = """
+function visible(el) { return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)); }
+function label(input) {
+	var el = input.id && document.querySelector('label[for="' + input.id + '"]');
+	return el ? el.innerText.trim() : input.value;
+}
+var dialog = document.querySelector('div[role="dialog"], .jobs-easy-apply-modal');
+if (!dialog) {
+	return [];
+}
+return Array.from(dialog.querySelectorAll('.jobs-easy-apply-form-section__grouping')).filter(visible).map(function (group, i) {
+	group.setAttribute('data-easy-apply-field', i);
+	var radios = Array.from(group.querySelectorAll('input[type="radio"]'));
+	var select = group.querySelector('select');
+	var checkbox = group.querySelector('input[type="checkbox"]');
+	var text = group.querySelector('input[type="text"], input[type="number"], input:not([type]), textarea');
+	var kind = radios.length ? 'radio' : select ? 'select' : checkbox ? 'checkbox' : text ? 'text' : null;
+	var filled = radios.length ? radios.some(function (radio) { return radio.checked; })
+		: select ? !!select.value && !/^Select an option$/i.test(select.options[select.selectedIndex].text)
+		: checkbox ? checkbox.checked
+		: text ? !!text.value : true;
+	return {
+		index: i,
+		kind: kind,
+		question: group.innerText.trim(),
+		options: radios.length ? radios.map(label) : select ? Array.from(select.options).map(function (o) { return o.text.trim(); }) : [],
+		filled: filled,
+		error: !!group.querySelector('[data-test-form-element-error-message="true"]')
+	};
+}).filter(function (field) { return field.kind; });
+"""
+
+# Sets every value through the native setters and fires the events the form listens to; returns the indexes it could not fill.
+FILL_SCRIPT = """
+function same(a, b) { return String(a).trim().toLowerCase() === String(b).trim().toLowerCase(); }
+function setValue(el, value) {
+	var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+		: el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+	Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+	['input', 'change', 'blur'].forEach(function (type) { el.dispatchEvent(new Event(type, {bubbles: true})); });
+}
+function label(input) {
+	var el = input.id && document.querySelector('label[for="' + input.id + '"]');
+	return el ? el.innerText.trim() : '';
+}
+return arguments[0].filter(function (field) {
+	var group = document.querySelector('[data-easy-apply-field="' + field.index + '"]');
+	if (!group) {
+		return true;
+	}
+	if (field.kind === 'radio') {
+		var radio = Array.from(group.querySelectorAll('input[type="radio"]')).filter(function (radio) {
+			return same(radio.value, field.value) || same(label(radio), field.value);
+		})[0];
+		if (!radio) {
+			return true;
+		}
+		radio.click();
+	} else if (field.kind === 'checkbox') {
+		var box = group.querySelector('input[type="checkbox"]');
+		if (box.checked !== /^(yes|true)$/i.test(field.value)) {
+			box.click();
+		}
+	} else if (field.kind === 'select') {
+		var select = group.querySelector('select');
+		var option = Array.from(select.options).filter(function (option) {
+			return same(option.text, field.value) || same(option.value, field.value);
+		})[0];
+		if (!option) {
+			return true;
+		}
+		setValue(select, option.value);
+	} else {
+		var input = group.querySelector('input[type="text"], input[type="number"], input:not([type]), textarea');
+		input.focus();
+		setValue(input, field.value);
+	}
+	return false;
+}).map(function (field) { return field.index; });
+"""
+
+
+def read_fields(browser):
+	return browser.execute_script(FIELDS_SCRIPT)
+
+
+def fill_fields(browser, values):
+	"""Apply a list of {index, kind, value} in one call; returns the indexes that could not be filled."""
+	return browser.execute_script(FILL_SCRIPT, values)
@@ -0,0 +1,127 @@
+"""Measure the bot's throughput offline against the local LinkedIn stand-in.
+
+	python benchmark.py --jobs 50 --sleep-scale 0.05
+	python benchmark.py --history
+
+Every run is appended to a JSONL results file so runs can be compared over time.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import easyapplybot
+import standin
+from answers import AnswerBook
+from metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class BenchmarkBot(easyapplybot.EasyApplyBot):
+	"""EasyApplyBot pointed at the stand-in, running headless."""
+
+	def browser_options(self):
+		options = super().browser_options()
+		if self.lean is None:
+			options.add_argument('--headless')
+			options.add_argument('--window-size=1280,1024')
+		return options
+
+
+def git_revision():
+	try:
+		return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def summarize(samples):
+	samples = sorted(samples)
+	return {
+		'count': len(samples),
+		'mean': round(statistics.mean(samples), 3),
+		'p50': round(samples[len(samples) // 2], 3),
+		'p95': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+	}
+
+
+def run(jobs, sleep_scale, max_search_time, latency, lean=False, http=False):
+	"""Run one search against a fresh stand-in and return the measurements."""
+	fake = standin.StandIn(jobs, latency=latency)
+	server = standin.serve(fake)
+	real_sleep = time.sleep
+	workdir = tempfile.mkdtemp(prefix="easyapply-bench-")
+
+	# every deliberate delay in the bot goes through time.sleep
+	time.sleep = lambda seconds: real_sleep(seconds * sleep_scale)
+	BenchmarkBot.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+	BenchmarkBot.MAX_SEARCH_TIME = max_search_time
+	try:
+		start = time.time()
+		metrics = Metrics(os.path.join(workdir, 'metrics.jsonl'))
+		bot = BenchmarkBot("bench",
+						   "bench",
+						   filename=os.path.join(workdir, 'output.csv'),
+						   answers=AnswerBook(filename=os.path.join(workdir, 'answers.yaml')),
+						   metrics=metrics,
+						   lean={} if lean else None,
+						   discovery='http' if http else 'browser')
+		bot.start_apply(["Data Scientist"], ["Remote"])
+		elapsed = time.time() - start
+	finally:
+		time.sleep = real_sleep
+		server.shutdown()
+
+	processed = metrics.jobs
+	breakdown = metrics.breakdown()
+	return {
+		'timestamp': datetime.now().isoformat(timespec='seconds'),
+		'revision': git_revision(),
+		'params': {'jobs': jobs, 'sleep_scale': sleep_scale, 'latency': latency, 'lean': lean, 'http': http},
+		'elapsed': round(elapsed, 2),
+		'jobs_processed': processed,
+		'applications': len(fake.applications),
+		'jobs_per_minute': round(processed / elapsed * 60, 2) if elapsed else 0,
+		'webdriver_calls_per_job': round(metrics.commands / processed, 1) if processed else None,
+		'http_requests': fake.requests,
+		'breakdown': {kind: round(seconds, 2) for kind, seconds in breakdown.items()},
+		'phases': {phase: summarize(samples) for phase, samples in metrics.durations.items() if samples},
+		'pages': {name: summarize(samples) for name, samples in metrics.values.items() if samples},
+	}
+
+
+def history(results_file):
+	with open(results_file, encoding='utf-8') as f:
+		runs = [json.loads(line) for line in f if line.strip()]
+	print(f"{'timestamp':20} {'revision':9} {'jobs/min':>9} {'calls/job':>10} {'applied':>8} {'elapsed':>8}")
+	for result in runs:
+		print(f"{result['timestamp']:20} {str(result['revision']):9} {result['jobs_per_minute']:>9} "
+			  f"{str(result['webdriver_calls_per_job']):>10} {result['applications']:>8} {result['elapsed']:>8}")
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--jobs", type=int, default=50, help="jobs served by the stand-in search")
+	parser.add_argument("--sleep-scale", type=float, default=0.05, help="factor applied to every sleep in the bot")
+	parser.add_argument("--max-search-time", type=int, default=10 * 60, help="seconds before the search is abandoned")
+	parser.add_argument("--latency", type=float, default=0.0, help="seconds the stand-in adds to every request")
+	parser.add_argument("--lean", action="store_true", help="run the bot in lean mode")
+	parser.add_argument("--http", action="store_true", help="read search results over HTTP instead of the browser")
+	parser.add_argument("--results", default="benchmark_results.jsonl", help="JSONL file the results are appended to")
+	parser.add_argument("--history", action="store_true", help="print earlier results instead of running")
+	args = parser.parse_args()
+
+	if args.history:
+		history(args.results)
+	else:
+		logging.basicConfig(level=logging.WARNING)
+		result = run(args.jobs, args.sleep_scale, args.max_search_time, args.latency, args.lean, args.http)
+		with open(args.results, 'a', encoding='utf-8') as f:
+			f.write(json.dumps(result) + "\n")
+		print(json.dumps(result, indent=2))
@@ -0,0 +1,105 @@
+"""Save where a run is, so `--resume` can continue after a crash."""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class Checkpoint:
+	"""Remaining combos plus, per worker, the combo, page offset, pending jobs and counters.
+
+	The state is rewritten atomically after every job. It also keeps the
+	claim ledger owner, so a resumed run takes back the claims of the run
+	that stopped instead of waiting for their leases to expire. With no path
+	every method is a no-op apart from scheduling.
+	"""
+
+	def __init__(self, path=None):
+		self.path = path
+		self.lock = threading.Lock()
+		self.workers = {}
+		self.combos = None
+		self.restored = None
+		self.resume_points = {}
+		self.owner = None
+
+	def restore(self):
+		"""Load the last saved state; returns False when there is none."""
+		if not self.path or not os.path.isfile(self.path):
+			log.warning("No checkpoint to resume from at %s", self.path)
+			return False
+		with open(self.path, encoding='utf-8') as f:
+			self.restored = json.load(f)
+		self.owner = self.restored.get('owner')
+		for worker in self.restored['workers'].values():
+			self.resume_points[(worker['position'], worker['location'])] = worker
+		log.info("Resuming %s searches in progress and %s queued from %s",
+				 len(self.resume_points), len(self.restored['combos']), self.path)
+		return True
+
+	def schedule(self, frontier, positions, locations):
+		"""Queue the restored combos, in-progress ones first, or ask the frontier for a fresh schedule."""
+		if self.restored is None:
+			self.combos = frontier.schedule(positions, locations)
+		else:
+			self.combos = queue.Queue()
+			for combo in self.resume_points:
+				self.combos.put(combo)
+			for combo in map(tuple, self.restored['combos']):
+				if combo not in self.resume_points:
+					self.combos.put(combo)
+		return self.combos
+
+	def take(self, position, location):
+		"""Pop the saved progress of a combo, if it was interrupted last time."""
+		with self.lock:
+			return self.resume_points.pop((position, location), None)
+
+	def update(self, position, location, page, pending, elapsed, applications):
+		with self.lock:
+			self.workers[threading.current_thread().name] = {
+				'position': position,
+				'location': location,
+				'page': page,
+				'pending': pending,
+				'elapsed': elapsed,
+				'applications': applications,
+			}
+			self.save()
+
+	def finish(self):
+		"""The current worker finished its combo."""
+		with self.lock:
+			self.workers.pop(threading.current_thread().name, None)
+			self.save()
+
+	def save(self):
+		if not self.path:
+			return
+		# restored progress that no worker has picked up yet must survive another crash
+		waiting = {f"restored-{i}": point for i, point in enumerate(self.resume_points.values())}
+		state = {
+			'saved_at': time.time(),
+			'owner': self.owner,
+			'combos': list(self.combos.queue) if self.combos is not None else [],
+			'workers': {**waiting, **self.workers},
+		}
+		temp = self.path + '.tmp'
+		with open(temp, 'w', encoding='utf-8') as f:
+			json.dump(state, f)
+		os.replace(temp, self.path)
+
+	def clear(self):
+		"""The run completed; nothing left to resume unless restored searches were not picked up."""
+		if self.resume_points:
+			log.warning("Keeping %s for %s interrupted searches that were not resumed",
+						self.path, len(self.resume_points))
+			with self.lock:
+				self.save()
+			return
+		if self.path and os.path.isfile(self.path):
+			os.remove(self.path)
@@ -0,0 +1,87 @@
+"""Let several bot processes split the same searches without doing a job twice."""
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+log = logging.getLogger(__name__)
+
+
+class ClaimLedger:
+	"""Job IDs and search combos claimed by bot processes, kept in a SQLite file.
+
+	A claim is a lease held by one process. A heartbeat thread renews the
+	leases of the live process, so the claims of a process that died expire
+	after `lease_seconds` and can be taken by another one. Completed claims
+	stay taken for their hold time, or for good when it is None.
+
+	Another backend only needs `claim`, `complete`, `release` and `close`.
+	"""
+
+	def __init__(self, path, lease_seconds=600, combo_hold_hours=12, owner=None):
+		self.path = path
+		self.lease_seconds = lease_seconds
+		self.combo_hold_hours = combo_hold_hours
+		self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+		self.db.execute("PRAGMA journal_mode=WAL")
+		self.db.executescript("""
+			CREATE TABLE IF NOT EXISTS claims (
+				kind TEXT NOT NULL,
+				key TEXT NOT NULL,
+				owner TEXT NOT NULL,
+				expires REAL,
+				done INTEGER NOT NULL DEFAULT 0,
+				PRIMARY KEY (kind, key)
+			);
+		""")
+		self.stopped = threading.Event()
+		self.heartbeat = threading.Thread(target=self.renew_leases, name='ledger-heartbeat', daemon=True)
+		self.heartbeat.start()
+		log.info("Claiming work in %s as %s", path, self.owner)
+
+	def claim(self, kind, key):
+		"""Take `key` unless a live process holds it or it was completed; returns True when taken."""
+		now = time.time()
+		with self.lock, self.db:
+			cursor = self.db.execute("""
+				INSERT INTO claims VALUES (?, ?, ?, ?, 0)
+				ON CONFLICT (kind, key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires, done = 0
+				WHERE (claims.expires IS NOT NULL AND claims.expires < ?)
+					OR (claims.owner = excluded.owner AND claims.done = 0)
+			""", (kind, str(key), self.owner, now + self.lease_seconds, now))
+		return cursor.rowcount > 0
+
+	def complete(self, kind, key, hold_seconds=None):
+		"""Mark a claim as done; nobody can take it again for `hold_seconds`, or ever when None."""
+		expires = time.time() + hold_seconds if hold_seconds is not None else None
+		with self.lock, self.db:
+			self.db.execute("UPDATE claims SET done = 1, expires = ? WHERE kind = ? AND key = ? AND owner = ?",
+							(expires, kind, str(key), self.owner))
+
+	def release(self, kind, keys):
+		"""Give up claims that were taken but not worked on."""
+		with self.lock, self.db:
+			self.db.executemany("DELETE FROM claims WHERE kind = ? AND key = ? AND owner = ? AND done = 0",
+								[(kind, str(key), self.owner) for key in keys])
+
+	def renew_leases(self):
+		while not self.stopped.wait(self.lease_seconds / 3):
+			try:
+				with self.lock, self.db:
+					self.db.execute("UPDATE claims SET expires = ? WHERE owner = ? AND done = 0",
+									(time.time() + self.lease_seconds, self.owner))
+			except sqlite3.Error:
+				log.exception("Could not renew the leases in %s", self.path)
+
+	def close(self):
+		"""Stop the heartbeat and hand back everything this process did not finish."""
+		self.stopped.set()
+		self.heartbeat.join()
+		with self.lock, self.db:
+			self.db.execute("DELETE FROM claims WHERE owner = ? AND done = 0", (self.owner,))
+		self.db.close()
@@ -1,19 +1,19 @@
-import csv
+import argparse
 import json
 import logging
 import os
-import random
-import re
+import queue
+import shutil
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 
-import pandas as pd
 import pyautogui
-import win32com.client as comctl
+import requests
 import yaml
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -21,60 +21,230 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
-wsh = comctl.Dispatch("WScript.Shell")
+import applyform
+import failures
+import jobcards
+import readiness
+import recycling
+from pagesnapshot import PageSnapshot, has_class
+from answers import AnswerBook
+from checkpoint import Checkpoint
+from claimledger import ClaimLedger
+from failures import FormError, JobTimedOut, Redirected
+from fingerprint import FingerprintIndex
+from frontier import SearchFrontier
+from httpsearch import LOGGED_OUT_MARKERS, HTTPSearch, LoggedOut
+from metrics import DELAY, WAIT, Metrics, spanned
+from pacing import Pacer
+from ranking import RelevanceRanker
+from recycling import RecyclePolicy
+from resultswriter import ResultsWriter, result_row
+from uploads import check_uploads, file_inputs, match_upload
+from jobfilter import JobFilter
+from jobstore import AppliedJobStore
 
 log = logging.getLogger(__name__)
-driver = webdriver.Chrome(ChromeDriverManager().install())
 
 
 # pyinstaller --onefile --windowed --icon=app.ico easyapplybot.py
 
+class SharedState:
+	"""Applied job IDs, search statistics and the output writers, shared by every worker of a run.
+
+	With a claim ledger, job IDs and searches are also claimed from the other
+	bot processes sharing it. With `dedup` settings, applications are
+	fingerprinted so reposts of them can be skipped.
+	"""
+
+	def __init__(self, store, filename, output=None, ledger=None, dedup=None):
+		self.lock = threading.Lock()
+		self.store = store
+		self.ledger = ledger
+		self.frontier = SearchFrontier(store.path)
+		self.fingerprints = FingerprintIndex(store.path, **dedup) if dedup is not None else None
+		self.appliedJobIDs = store.recent_ids()
+		output = output or {}
+		self.results = ResultsWriter(filename, format_row=result_row, **output)
+		self.skipped = ResultsWriter(os.path.splitext(filename)[0] + '_skipped.csv', **output)
+
+	@classmethod
+	def for_output(cls, filename, lookback_days=2, output=None, ledger=None, dedup=None):
+		return cls(AppliedJobStore.for_output(filename, lookback_days), filename, output, ledger, dedup)
+
+	def claim(self, jobID):
+		"""Atomically reserve a job ID; returns False if it was already taken."""
+		with self.lock:
+			if jobID in self.appliedJobIDs:
+				return False
+			if self.ledger is not None and not self.ledger.claim('job', jobID):
+				return False
+			self.appliedJobIDs.add(jobID)
+			return True
+
+	def release(self, jobIDs):
+		"""Hand back reserved jobs that were not processed."""
+		jobIDs = list(jobIDs)
+		with self.lock:
+			self.appliedJobIDs.difference_update(jobIDs)
+		if self.ledger is not None and jobIDs:
+			self.ledger.release('job', jobIDs)
+
+	def complete(self, jobID, timestamp):
+		self.store.add(jobID, timestamp)
+		if self.ledger is not None:
+			lookback_days = self.store.lookback_days
+			self.ledger.complete('job', jobID, lookback_days * 24 * 60 * 60 if lookback_days is not None else None)
+
+	def claim_search(self, position, location):
+		return self.ledger is None or self.ledger.claim('search', f"{position}|{location}")
+
+	def complete_search(self, position, location):
+		if self.ledger is not None:
+			self.ledger.complete('search', f"{position}|{location}", self.ledger.combo_hold_hours * 60 * 60)
+
+	def close(self):
+		"""Flush the output files and hand back unfinished claims."""
+		self.results.close()
+		self.skipped.close()
+		if self.fingerprints is not None:
+			self.fingerprints.close()
+		if self.ledger is not None:
+			self.ledger.close()
+
+
 class EasyApplyBot:
+	BASE_URL = "https://www.linkedin.com"
 	MAX_SEARCH_TIME = 30 * 60
+	PAGE_TIMEOUT = 15
+	PREFETCH_DEPTH = 1
+	MAX_FORM_STEPS = 25
+	MAX_STALLED = 3
+	MEMORY_LOG_EVERY = 10
+	FORM_TIMEOUT = 3 * 60
+	JOB_TIMEOUT = 4 * 60
+	PAGE_LOAD_TIMEOUT = 30
+	JOB_CARD_SELECTOR = "div[data-job-id]"
+	APPLY_BUTTON_SELECTOR = "button[class*='jobs-apply']"
+	DESCRIPTION_XPATH = f"//*[{has_class('jobs-description')} or {has_class('jobs-description__content')} or @id='job-details']"
+	# URL patterns blocked in lean mode, by resource type
+	BLOCKED_RESOURCES = {
+		'image': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*media.licdn.com/dms/image*"],
+		'font': ["*.woff", "*.woff2", "*.ttf", "*.otf"],
+		'media': ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*dms.licdn.com/playlist*"],
+		'tracker': ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*bat.bing.com*",
+					"*connect.facebook.net*", "*px.ads.linkedin.com*", "*linkedin.com/li/track*",
+					"*linkedin.com/tscp-serving*", "*platform.linkedin.com/litms*"],
+	}
 
 	def __init__(self,
 				 username,
 				 password,
 				 uploads={},
 				 filename='output.csv',
-				 blacklist=[]):
+				 blacklist=[],
+				 lookback_days=2,
+				 answers=None,
+				 metrics=None,
+				 pacer=None,
+				 profile_dir=None,
+				 lean=None,
+				 job_filter=None,
+				 shared=None,
+				 checkpoint=None,
+				 recycle=None,
+				 job_timeout=None,
+				 ranker=None,
+				 discovery='browser'):
 
 		log.info("Welcome to Easy Apply Bot\n")
 		dirpath = os.getcwd()
 		log.info("current directory is : " + dirpath)
 
-		self.uploads = uploads
-		past_ids = self.get_appliedIDs(filename)
-		self.appliedJobIDs = past_ids if past_ids != None else []
+		self.uploads = check_uploads(uploads)
+		if shared is None:
+			shared = SharedState.for_output(filename, lookback_days)
+		self.shared = shared
+		self.appliedJobIDs = shared.appliedJobIDs
 		self.filename = filename
+		self.metrics = metrics if metrics is not None else Metrics()
+		self.pace = (pacer if pacer is not None else Pacer()).session(self.sleep)
+		self.profile_dir = profile_dir
+		self.lean = lean
+		self.recycle = recycle if recycle is not None else RecyclePolicy()
+		self.job_timeout = job_timeout or self.JOB_TIMEOUT
+		self.job_deadline = None
+		self.start_browser()
+		self.job_filter = job_filter if job_filter is not None else JobFilter(blacklist)
+		self.ranker = ranker
+		self.job_scores = {}
+		self.job_cards = {}
+		self.job_description = None
+		self.discovery = discovery
+		self.http_search = None
+		self.http_verified = False
+		self.answers = answers if answers is not None else AnswerBook()
+		self.checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+		self.username = username
+		self.password = password
+		self.login(username, password)
+
+	def start_browser(self):
 		self.options = self.browser_options()
-		self.browser = driver
-		self.wait = WebDriverWait(self.browser, 30)
-		self.blacklist = blacklist
-		self.start_linkedin(username, password)
-
-
-	def get_appliedIDs(self, filename):
+		self.browser = self.metrics.instrument(webdriver.Chrome(ChromeDriverManager().install(), options=self.options))
+		self.browser.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
+		if self.lean is not None:
+			log.info("Lean mode: blocking %s URL patterns", len(self.block_requests()))
+		self.prefetched = {}
+		self.browser_jobs = 0
+		self.browser_started = time.time()
+
+	def recycle_browser(self):
+		"""Log the browser's memory and restart it when the recycling policy says so.
+
+		Searches and jobs are opened by URL from the lookahead queue, so the
+		search position survives the restart; the session comes back from the
+		profile or by logging in again.
+		"""
+		self.browser_jobs += 1
+		rss = recycling.browser_rss(self.browser)
+		if rss is not None:
+			self.metrics.observe('browser_rss_mb', rss / 1024 / 1024)
+			if self.browser_jobs % self.MEMORY_LOG_EVERY == 0:
+				log.info("Browser memory after %s jobs: %.0f MB", self.browser_jobs, rss / 1024 / 1024)
+		reason = self.recycle.reason(self.browser_jobs, self.browser_started, rss)
+		if reason is None:
+			return
+		log.info("Restarting the browser after %s", reason)
+		self.close_prefetched()
+		self.restart_browser()
+
+	@spanned('restart_browser')
+	def restart_browser(self):
 		try:
-			df = pd.read_csv(filename,
-							header=None,
-							names=['timestamp', 'jobID', 'job', 'company', 'attempted', 'result'],
-							lineterminator='\n',
-							encoding='utf-8')
-
-			df['timestamp'] = pd.to_datetime(df['timestamp'], format="%Y-%m-%d %H:%M:%S.%f")
-			df = df[df['timestamp'] > (datetime.now() - timedelta(days=2))]
-			jobIDs = list(df.jobID)
-			print(f"{len(jobIDs)} jobIDs found")
-			return jobIDs
-		except Exception as e:
-			print(str(e) + "   jobIDs could not be loaded from CSV {}".format(filename))
-			return None
+			self.browser.quit()
+		except WebDriverException:
+			log.warning("The old browser did not quit cleanly")
+		self.start_browser()
+		self.login(self.username, self.password)
+		if self.lean is None:
+			self.browser.maximize_window()
+		if self.http_search is not None:
+			# cookies are copied again from the new browser on the next search page
+			self.http_search.close()
+			self.http_search = None
 
 
 	def browser_options(self):
 		options = Options()
-		options.add_argument("--start-maximized")
+		if self.lean is not None:
+			width, height = self.lean.get('window_size', (1280, 800))
+			options.add_argument(f"--window-size={width},{height}")
+			if self.lean.get('headless', True):
+				options.add_argument('--headless')
+			if 'image' in self.lean.get('block', self.BLOCKED_RESOURCES):
+				options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+		else:
+			options.add_argument("--start-maximized")
 		options.add_argument("--ignore-certificate-errors")
 		options.add_argument('--no-sandbox')
 		options.add_argument("--disable-extensions")
@@ -82,122 +252,265 @@ class EasyApplyBot:
 		#Disable webdriver flags or you will be easily detectable
 		options.add_argument("--disable-blink-features")
 		options.add_argument("--disable-blink-features=AutomationControlled")
+
+		#Keep cookies between runs so the login can be skipped
+		if self.profile_dir:
+			options.add_argument("--user-data-dir=" + os.path.abspath(self.profile_dir))
 		return options
 
+	def block_requests(self):
+		"""Block the resource types and URL patterns lean mode does not need in the current tab, through CDP."""
+		patterns = list(self.lean.get('block_urls', []))
+		for resource in self.lean.get('block', self.BLOCKED_RESOURCES):
+			patterns += self.BLOCKED_RESOURCES.get(resource, [])
+		self.browser.execute_cdp_cmd('Network.enable', {})
+		self.browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+		return patterns
+
+	def sleep(self, seconds):
+		"""Deliberate, human-like pause."""
+		with self.metrics.span('sleep', DELAY):
+			time.sleep(seconds)
+
+	def login(self, username, password):
+		"""Reuse the session saved in the browser profile, logging in only when it has expired."""
+		if self.profile_dir and self.is_logged_in():
+			log.info("Reusing the LinkedIn session saved in %s", self.profile_dir)
+			return
+		self.start_linkedin(username, password)
+
+	@spanned('session_check', WAIT)
+	def is_logged_in(self):
+		self.browser.get(self.BASE_URL + "/feed/")
+		url = self.browser.current_url
+		return not any(marker in url for marker in LOGGED_OUT_MARKERS)
+
+	@spanned('login')
 	def start_linkedin(self,username,password):
 		log.info("Logging in.....Please wait :)  ")
-		self.browser.get("https://www.linkedin.com/login?trk=guest_homepage-basic_nav-header-signin")
+		self.browser.get(self.BASE_URL + "/login?trk=guest_homepage-basic_nav-header-signin")
 		try:
 			user_field = self.browser.find_element_by_id("username")
 			pw_field = self.browser.find_element_by_id("password")
 			login_button = self.browser.find_element_by_css_selector(".btn__primary--large")
+			self.pace.action()
 			user_field.send_keys(username)
 			user_field.send_keys(Keys.TAB)
-			time.sleep(1)
+			self.pace.action()
 			pw_field.send_keys(password)
-			time.sleep(1)
+			self.pace.action()
 			login_button.click()
 		except TimeoutException:
 			log.info("TimeoutException! Username/password field or login button not found")
 
 	def fill_data(self):
+		if self.lean is not None:
+			return
 		self.browser.set_window_size(0, 0)
 		self.browser.set_window_position(2000, 2000)
 
 
 	def start_apply(self, positions, locations):
-		start = time.time()
 		self.fill_data()
-
-		combos = []
-		while len(combos) < len(positions) * len(locations):
-			position = positions[random.randint(0, len(positions) - 1)]
-			location = locations[random.randint(0, len(locations) - 1)]
-			combo = (position, location)
-			if combo not in combos:
-				combos.append(combo)
-				log.info(f"Applying to {position}: {location}")
-				location = "&location=" + location
-				self.applications_loop(position, location)
-			if len(combos) > 20:
-				break
+		self.apply_combos(self.checkpoint.schedule(self.shared.frontier, positions, locations))
 		self.finish_apply()
+		self.checkpoint.clear()
+		self.metrics.summary()
+
+	def apply_combos(self, combos):
+		"""Run searches for (position, location) pairs taken from a queue until it is empty."""
+		while True:
+			try:
+				position, location = combos.get_nowait()
+			except queue.Empty:
+				return
+			if not self.shared.claim_search(position, location):
+				log.info(f"Another bot is searching {position}: {location}")
+				continue
+			log.info(f"Applying to {position}: {location}")
+			self.current_combo = (position, location)
+			pages = self.applications_loop(position, "&location=" + location)
+			self.shared.frontier.record(position, location, pages)
+			self.shared.complete_search(position, location)
 
 	def applications_loop(self, position, location):
+		"""Run one search as a pipeline of discover, filter, fetch, apply and record stages.
 
-		count_application = 0
-		count_job = 0
-		jobs_per_page = 0
-		start_time = time.time()
+		Discovery and filtering are a lazy generator, so a results page is only
+		loaded when the bounded lookahead queue has room for more jobs. The next
+		job page and the next results page are prefetched in background tabs
+		while the current application is being filled in.
 
+		Progress is checkpointed after every job, and a search interrupted in an
+		earlier run continues from its saved page with its pending jobs.
 
-		log.info("Looking for jobs.. Please wait..")
+		Returns, per results page offset, [jobs processed, applications, seconds].
+		"""
+		resume = self.checkpoint.take(*self.current_combo) or {'page': 0, 'pending': [], 'elapsed': 0}
+		start_time = time.time() - resume['elapsed']
+		if 'applications' in resume:
+			self.pace.submitted = resume['applications']
+		self.search_pages = defaultdict(lambda: [0, 0, 0.0])
 
-		self.browser.set_window_position(0, 0)
-		self.browser.maximize_window()
-		self.browser, _ = self.next_jobs_page(position, location, jobs_per_page)
 		log.info("Looking for jobs.. Please wait..")
 
+		if self.lean is None:
+			self.browser.set_window_position(0, 0)
+			self.browser.maximize_window()
+
+		self.discovery_page = resume['page']
+		discovered = self.discover_jobs(position, location, start=resume['page'])
+		lookahead = queue.Queue(maxsize=self.PREFETCH_DEPTH + 1)
+		exhausted = False
+		for page, position_number, jobID in resume['pending']:
+			if self.shared.claim(jobID):
+				lookahead.put_nowait((page, position_number, jobID))
+		self.save_checkpoint(lookahead, start_time)
+
 		while time.time() - start_time < self.MAX_SEARCH_TIME:
 			log.warning(f"{(self.MAX_SEARCH_TIME - (time.time() - start_time))//60} minutes left in this search")
 
-			# sleep to make sure everything loads, add random to make us look human.
-			randoTime = random.uniform(3.5, 6.9)
-			log.info("Sleeping for %s", randoTime)
-			time.sleep(randoTime)
-			self.load_page(sleep=1)
+			# top up the lookahead; the generator only loads another results page when there is room
+			while not exhausted and not lookahead.full():
+				try:
+					lookahead.put_nowait(next(discovered))
+				except StopIteration:
+					exhausted = True
+			if lookahead.empty():
+				break
 
-			# get job links
-			links = self.browser.find_elements_by_xpath(
-					'//div[@data-job-id]'
-					)
+			page, position_number, jobID = lookahead.get_nowait()
+			for _, _, nextJobID in list(lookahead.queue):
+				self.prefetch(self.job_url(nextJobID))
 
-			if len(links) == 0:
-				break
+			job_start = time.time()
+			with self.metrics.job(jobID):
+				button, result, string_easy, job, failure = self.apply_to_job(jobID)
+
+				log.info(f"\nSuccess?: {result} \n Position {position_number}\n {self.browser.title} \n {string_easy} \n {job}")
 
-			# get job ID of each job link
-			IDs = []
-			for link in links:
-				children = link.find_elements_by_xpath(
-					'.//a[@data-control-name]'
-					)
-				for child in children:
-					if child.text not in self.blacklist:
-						temp = link.get_attribute("data-job-id")
-						jobID = temp.split(":")[-1]
-						IDs.append(int(jobID))
-			IDs = set(IDs)
-
-			# remove already applied jobs
-			before = len(IDs)
-			jobIDs = [x for x in IDs if x not in self.appliedJobIDs]
-			after = len(jobIDs)
-
-			if len(jobIDs) == 0 and len(IDs) > 24:
-				jobs_per_page = jobs_per_page + 25
-				count_job = 0
-				# TODO avoid lock function disabled during debugging.
-				#  Turn back on with major release and running while sleeping.
-				#self.avoid_lock()
-				self.browser, jobs_per_page = self.next_jobs_page(position,
-																	location,
-																	jobs_per_page)
-			# loop over IDs to apply
+				self.write_to_file(button, jobID, self.browser.title, result, failure)
+
+			stats = self.search_pages[page]
+			stats[0] += 1
+			stats[1] += 1 if result else 0
+			stats[2] += time.time() - job_start
+			self.save_checkpoint(lookahead, start_time)
+			self.recycle_browser()
+
+		discovered.close()
+		self.shared.release(jobID for _, _, jobID in list(lookahead.queue))
+		self.close_prefetched()
+		self.checkpoint.finish()
+		return self.search_pages
+
+	def save_checkpoint(self, lookahead, start_time):
+		# resume from the earliest page with unfinished jobs; claimed or recorded jobs on it are not repeated
+		pending = list(lookahead.queue)
+		page = min([page for page, _, _ in pending] + [self.discovery_page])
+		self.checkpoint.update(*self.current_combo,
+							   page=page,
+							   pending=pending,
+							   elapsed=time.time() - start_time,
+							   applications=self.pace.submitted)
+
+	def discover_jobs(self, position, location, start=0):
+		"""Discovery, filter and ranking stages: yield (page offset, position number, job ID) for unseen jobs."""
+		jobs_per_page = start
+		while True:
+			cards = self.search_cards(position, location, jobs_per_page)
+
+			# touch the page so it is counted even when it has no new jobs
+			self.search_pages[jobs_per_page]
+			if len(cards) == 0:
+				return
+
+			# skip jobs that can be ruled out from the card alone, before opening them
+			candidates = []
+			for card in cards:
+				reason = self.job_filter.reason(card) or self.repost_of(card)
+				if reason:
+					self.record_skipped(card, reason)
+				else:
+					candidates.append(card)
+
+			# best matches first, poor matches not at all
+			scores = {}
+			if self.ranker is not None:
+				ranked, below = self.ranker.rank(candidates)
+				for score, card in below:
+					self.record_skipped(card, f"relevance {score} below {self.ranker.threshold}")
+				candidates = [card for _, card in ranked]
+				scores = {card['jobID']: score for score, card in ranked}
+
+			# remove already applied jobs, and reserve the rest so no other worker takes them
+			jobIDs = [card['jobID'] for card in candidates if self.shared.claim(card['jobID'])]
+			self.job_scores.update((jobID, scores[jobID]) for jobID in jobIDs if jobID in scores)
+			self.job_cards.update((card['jobID'], card) for card in candidates if card['jobID'] in jobIDs)
+			log.info(f"{len(jobIDs)} new jobs out of {len(cards)} on this page")
+
+			last_page = len(cards) < 25
 			for i, jobID in enumerate(jobIDs):
-				count_job += 1
-				tabs = len(self.browser.window_handles)
-				job, jobPage = self.get_job_page(jobID)
-
-				# get easy apply button
-				button = self.get_easy_apply_button()
-				if button :
-					log.info("It appears that the apply button is considered an EASY apply")
-					#TODO Need to confirm that its an easy apply button by checking the URL is still linkedin URL and not a redirect
-					string_easy = "* has Easy Apply Button"
+				if i == len(jobIDs) - 1 and not last_page and self.discovery == 'browser':
+					# the pipeline is about to run dry, start loading the next results page
+					self.prefetch(self.search_url(position, location, jobs_per_page + 25))
+				try:
+					yield jobs_per_page, jobs_per_page + i + 1, jobID
+				except GeneratorExit:
+					# the search stopped early; let other workers have the rest of this page
+					self.shared.release(jobIDs[i + 1:])
+					raise
+
+			if last_page:
+				return
+			jobs_per_page = self.discovery_page = jobs_per_page + 25
+			log.info('Going to next jobs page, YEAAAHHH!!')
+
+	def apply_to_job(self, jobID):
+		"""Fetch and apply stages for a single job; returns (button, result, string_easy, job, failure).
+
+		The job runs under a time budget of `job_timeout` seconds that caps every
+		wait. An exception only fails this job: it is classified, the page is
+		cleaned up for the next job and `failure` says what went wrong.
+		"""
+		job = self.job_url(jobID)
+		button, result, failure = False, False, None
+		string_easy = "* Doesn't have Easy Apply Button"
+		self.job_deadline = time.time() + self.job_timeout
+		self.job_handle = None
+		self.job_description = None
+		try:
+			job, jobPage = self.get_job_page(jobID)
+			self.job_handle = self.browser.current_window_handle
+			# counted once the job page is showing, as opening a prefetched tab closes the previous one
+			tabs = len(self.browser.window_handles)
+
+			# a repost that kept nothing but its description is only recognisable here
+			card = self.job_cards.get(jobID)
+			repost = None
+			if self.shared.fingerprints is not None and card is not None:
+				description = jobPage.first(self.DESCRIPTION_XPATH)
+				self.job_description = description.text_content().strip() if description is not None else None
+				repost = self.repost_of(card, self.job_description)
+				if repost:
+					self.record_skipped(card, repost)
+					string_easy = "* Repost of an earlier application"
+
+			# get easy apply button
+			button = False if repost else self.get_easy_apply_button()
+			if button :
+				log.info("It appears that the apply button is considered an EASY apply")
+				string_easy = "* has Easy Apply Button"
+				# wait for the application caps before the form is opened, outside the job's time budget
+				reserved = time.time()
+				slot = self.pace.start_application()
+				self.job_deadline += time.time() - reserved
+				try:
 					log.info("Clicking the EASY apply button")
+					self.pace.action()
 					button.click()
-					log.info("Wait for page to load")
-					time.sleep(3)
+					log.info("Wait for the form to open")
+					self.wait_for_easy_apply(tabs)
 					log.info("Checking to see if the current URL is the same as the job URL")
 					log.info(self.browser.current_url)
 					log.info(job)
@@ -205,67 +518,150 @@ class EasyApplyBot:
 					if self.browser.current_url == job and (newTabs == tabs):
 						log.info("The URLs match; Attempting to apply")
 						result = self.send_resume()
-						count_application += 1
 					else:
 						log.info("The URLs do not match")
 						string_easy = "* Doesn't have Easy Apply Button"
-						result = False
-				else:
-					log.info("The button does not exist.")
-					string_easy = "* Doesn't have Easy Apply Button"
-					result = False
-
-				position_number = str(count_job + jobs_per_page)
-				log.info(f"\nSuccess?: {result} \n Position {position_number}\n {self.browser.title} \n {string_easy} \n {job}")
-
-				self.write_to_file(button, jobID, self.browser.title, result)
-
-				# sleep every 20 applications
-				if count_application != 0  and count_application % 20 == 0:
-					sleepTime = random.randint(500, 900)
-					log.info(f'********count_application: {count_application}************\n\n')
-					log.info(f"Time for a nap - see you in:{int(sleepTime/60)} min")
-					log.info('****************************************\n\n')
-					time.sleep(sleepTime)
-
-				# go to new page if all jobs are done
-				if count_job == len(jobIDs):
-					jobs_per_page = jobs_per_page + 25
-					count_job = 0
-					log.info('****************************************\n\n')
-					log.info('Going to next jobs page, YEAAAHHH!!')
-					log.info('****************************************\n\n')
-					#self.avoid_lock()
-					self.browser, jobs_per_page = self.next_jobs_page(position,
-																		location,
-																		jobs_per_page)
-			if len(jobIDs) == 0 or i == (len(jobIDs) - 1):
-				break
-
-	def write_to_file(self, button, jobID, browserTitle, result):
-		def re_extract(text, pattern):
-			target = re.search(pattern, text)
-			if target:
-				target = target.group(1)
-			return target
-
+						raise Redirected(self.browser.current_url)
+				finally:
+					self.pace.finish_application(slot, result)
+			elif not repost:
+				log.info("The button does not exist.")
+		except Exception as e:
+			failure = failures.classify(e)
+			log.warning("Job %s failed (%s): %s", jobID, failure, e)
+			self.metrics.observe('failed_' + failure, 1)
+			self.reset_job(failure)
+		finally:
+			self.job_deadline = None
+		return button, result, string_easy, job, failure
+
+	def time_left(self, cap):
+		"""Seconds a wait may take: `cap`, cut short by the budget of the current job."""
+		if self.job_deadline is None:
+			return cap
+		left = self.job_deadline - time.time()
+		if left <= 0:
+			raise JobTimedOut(f"job took longer than {self.job_timeout}s")
+		return min(cap, left)
+
+	def reset_job(self, failure):
+		"""Leave a failed job so the next one can start: no modal, no stray tabs, nothing loading."""
+		if failure == 'browser_crash':
+			self.restart_browser()
+			return
+		try:
+			handle = self.job_handle or self.browser.current_window_handle
+			for other in self.browser.window_handles:
+				if other != handle and other not in self.prefetched.values():
+					self.browser.switch_to.window(other)
+					self.browser.close()
+			self.browser.switch_to.window(handle)
+			self.browser.execute_script("window.stop();")
+			if applyform.dismiss(self.browser):
+				log.info("Dismissed the Easy Apply form")
+		except WebDriverException:
+			log.exception("Could not clean up after the failed job, restarting the browser")
+			self.restart_browser()
+
+	def wait_for_easy_apply(self, tabs, timeout=3):
+		"""Wait until the Easy Apply modal opens, or the click opened a tab or navigated away."""
+		url = self.browser.current_url
+		try:
+			WebDriverWait(self.browser, self.time_left(timeout)).until(
+				lambda browser: len(browser.window_handles) != tabs
+				or browser.current_url != url
+				or browser.find_elements_by_css_selector("div[role='dialog']"))
+		except TimeoutException:
+			log.info("No Easy Apply form opened after %ss", timeout)
+
+	def prefetch(self, url):
+		"""Start loading a page in a background tab so it is ready when it is needed."""
+		if url in self.prefetched or len(self.prefetched) >= self.PREFETCH_DEPTH + 1:
+			return
+		handles = set(self.browser.window_handles)
+		# the page is requested here, so this is the action LinkedIn sees
+		self.pace.action()
+		if self.lean is None:
+			self.browser.execute_script("window.open(arguments[0], '_blank');", url)
+		else:
+			# request blocking only applies to the tab it was set in, so set it before the page loads
+			self.browser.execute_script("window.open('about:blank', '_blank');")
+		opened = set(self.browser.window_handles) - handles
+		if not opened:
+			return
+		handle = opened.pop()
+		if self.lean is not None:
+			current = self.browser.current_window_handle
+			self.browser.switch_to.window(handle)
+			self.block_requests()
+			self.browser.execute_script("window.location.href = arguments[0];", url)
+			self.browser.switch_to.window(current)
+		self.prefetched[url] = handle
+		log.debug("Prefetching %s", url)
+
+	def open_page(self, url):
+		"""Show a page, switching to its prefetched tab when there is one; the switch is not paced."""
+		handle = self.prefetched.pop(url, None)
+		if handle is None:
+			self.pace.action()
+			try:
+				self.browser.get(url)
+			except TimeoutException:
+				log.warning("%s still loading after %ss, using what has loaded", url, self.PAGE_LOAD_TIMEOUT)
+				self.browser.execute_script("window.stop();")
+			return
+		current = self.browser.current_window_handle
+		if current not in self.prefetched.values():
+			self.browser.close()
+		self.browser.switch_to.window(handle)
+
+	def close_prefetched(self):
+		current = self.browser.current_window_handle
+		for handle in self.prefetched.values():
+			self.browser.switch_to.window(handle)
+			self.browser.close()
+		self.prefetched = {}
+		self.browser.switch_to.window(current)
+
+	def repost_of(self, card, description=None):
+		"""Which earlier application the job duplicates, or None when it is new or dedup is off."""
+		if self.shared.fingerprints is None:
+			return None
+		repost = self.shared.fingerprints.match(card, description)
+		if repost:
+			log.info("Job %s (%s at %s) is a %s", card['jobID'], card['title'], card['company'], repost)
+		return repost
+
+	def record_skipped(self, card, reason):
+		log.debug("Skipping %s (%s at %s): %s", card['jobID'], card['title'], card['company'], reason)
+		self.shared.skipped.write(datetime.now(), card['jobID'], card['title'], card['company'], reason)
+
+	@spanned('write_to_file')
+	def write_to_file(self, button, jobID, browserTitle, result, failure=None):
+		# the title is split into job and company on the writer thread
 		timestamp = datetime.now()
 		attempted = False if button == False else True
-		job = re_extract(browserTitle.split(' | ')[0], r"\(?\d?\)?\s?(\w.*)")
-		company = re_extract(browserTitle.split(' | ')[1], r"(\w.*)" )
+		self.shared.results.write(timestamp, jobID, browserTitle, attempted, result, failure,
+								  self.job_scores.pop(jobID, None))
+		self.shared.complete(jobID, timestamp.timestamp())
+		card = self.job_cards.pop(jobID, None)
+		if result and card is not None and self.shared.fingerprints is not None:
+			self.shared.fingerprints.add(card, self.job_description, timestamp.timestamp())
 
-		toWrite = [timestamp, jobID, job, company, attempted, result]
-		with open(self.filename,'a') as f:
-			writer = csv.writer(f)
-			writer.writerow(toWrite)
 
+	def job_url(self, jobID):
+		return self.BASE_URL + '/jobs/view/'+ str(jobID) + '/'
 
+	@spanned('get_job_page')
 	def get_job_page(self, jobID):
 
-		job = 'https://www.linkedin.com/jobs/view/'+ str(jobID) + '/'
+		job = self.job_url(jobID)
 
-		self.browser.get(job)
-		self.job_page = self.load_page(sleep=0.5)
+		self.open_page(job)
+		self.job_page = self.load_page(sleep=0.5, selector=self.APPLY_BUTTON_SELECTOR)
+		stats = readiness.page_stats(self.browser)
+		self.metrics.observe('page_bytes', stats['bytes'])
+		self.metrics.observe('page_load_seconds', stats['load'])
 		return job, self.job_page
 
 
@@ -289,227 +685,161 @@ class EasyApplyBot:
 		except:
 			return False
 
+	@spanned('send_resume')
 	def send_resume(self):
-		def is_present(button_locator):
-			return (len(self.browser.find_elements(button_locator[0], button_locator[1])) > 0)
-
-		try:
-
-			time.sleep(random.uniform(2.2, 4.3))
-			log.info("Attempting to apply")
-			#TODO These locators are not future proof. These labels could easily change.
-			# Ideally we would search for contained text;
-			# was unable to get it to work using XPATH and searching for contained text
-			upload_locator = (By.CSS_SELECTOR, "label[aria-label='DOC, DOCX, PDF formats only (2 MB).']")
-			next_locator = (By.CSS_SELECTOR, "button[aria-label='Continue to next step']")
-			review_locator = (By.CSS_SELECTOR, "button[aria-label='Review your application']")
-			submit_locator = (By.CSS_SELECTOR, "button[aria-label='Submit application']")
-			submit_application_locator = (By.CSS_SELECTOR, "button[aria-label='Submit application']")
-			error_locator = (By.CSS_SELECTOR, "p[data-test-form-element-error-message='true']")
-			cover_letter = (By.CSS_SELECTOR, "input[name='file']")
-
-			question_locator = (By.XPATH, ".//div[@class='jobs-easy-apply-form-section__grouping']")
-			yes_locator = (By.XPATH, ".//input[@value='Yes']")
-			no_locator = (By.XPATH, ".//input[@value='No']")
-			textInput_locator = (By.XPATH, ".//input[@type='text']")
-
-
-			submitted = False
-			attemptQuestions = True
-			while not submitted:
-				button = None
-
-				# Upload  if possible
-
-				#TODO Should check if there is already a resume that is saved from the last time the application was attempted.
-				# If so, then remove and re upload it in case there is new version.
-				if is_present(upload_locator):
-					log.info("Resume upload option available. Attempting to upload.")
-					input_buttons = self.browser.find_elements(cover_letter[0],
-															 cover_letter[1])
-					for input_button in input_buttons:
-						parent = input_button.find_element(By.XPATH, "..")
-						sibling = parent.find_element(By.XPATH, "preceding-sibling::*")
-						grandparent = sibling.find_element(By.XPATH, "..")
-						for key in self.uploads.keys():
-							if key in sibling.text or key in grandparent.text:
-								input_button.send_keys(self.uploads[key])
-
-				for i, button_locator in enumerate(
-						[upload_locator, next_locator, review_locator, submit_locator, submit_application_locator]):
-
-					#Sleep every iteration so that the bot is harded to detect.
-					time.sleep(random.uniform(2.2, 4.3))
-
-					log.info("Searching for button locator: %s", str(button_locator))
-					if is_present(button_locator):
-						log.info("button found with this locator: %s", str(button_locator))
-						try:
-							button = self.wait.until(EC.element_to_be_clickable(button_locator))
-						except TimeoutException:
-							log.exception("Timed out waiting for button %s ", button_locator)
-							continue
-					else:
-						log.info("Unable to find button locator: %s", str(button_locator))
-						continue
-
-					if is_present(error_locator):
-						log.info("Checking for errors")
-						for errorElement in self.browser.find_elements(error_locator[0],
-																  error_locator[1]):
-							text = errorElement.text
-							if "Please enter a valid answer" in text:
-								log.warning("Warning message received: %s", text)
-								log.info("Attempting to resolve by finding test questions")
-
-								#TODO these questions will need to be logged so that way, individuals can look through the logs and add them at the end of an application run.
-								#Required question expects an answer. Search through possible questions/answer combos
-								if is_present(question_locator) and attemptQuestions:
-									questionSections = self.browser.find_elements(question_locator[0], question_locator[1])
-									for questionElement in questionSections:
-										try:
-											log.info("Found test element %s", questionElement)
-											text = questionElement.text
-											log.warning("Question Text: %s", text)
-											#assuming this question is asking if I am authorized to work in the US
-											if ("Are you" in text and "authorized" in text) or ("Have You" in text and "education" in text):
-												#Be sure to find the child element of the current test question section
-												yesRadio = questionElement.find_element(By.XPATH, yes_locator[1])
-												time.sleep(1)
-												log.info("Attempting to click the radio button for %s", yes_locator)
-												self.browser.execute_script("arguments[0].click()", yesRadio)
-												log.info("Clicked the radio button %s", yes_locator)
-
-											#assuming this question is asking if I require sponsorship
-											elif "require" in text and "sponsorship" in text:
-												noRadio = questionElement.find_element(By.XPATH, no_locator[1])
-												time.sleep(1)
-												log.info("Attempting to click the radio button for %s", no_locator)
-												self.browser.execute_script("arguments[0].click()", noRadio)
-												log.info("Clicked the radio button %s", no_locator)
-
-											# assuming this question is asking if I have a Bachelor's degree
-											elif (("You have" in text) or ("Have you" in text)) and "Bachelor's" in text:
-												yesRadio = questionElement.find_element(By.XPATH, yes_locator[1])
-												time.sleep(1)
-												log.info("Attempting to click the radio button for %s", yes_locator)
-												self.browser.execute_script("arguments[0].click()", yesRadio)
-												log.info("Clicked the radio button %s", yes_locator)
-
-											# assuming this question is asking if I have a Master's degree
-											elif (("You have" in text) or ("Have you" in text)) and "Master's" in text:
-												yesRadio = questionElement.find_element(By.XPATH, yes_locator[1])
-												time.sleep(1)
-												log.info("Attempting to click the radio button for %s", yes_locator)
-												self.browser.execute_script("arguments[0].click()", yesRadio)
-												log.info("Clicked the radio button %s", yes_locator)
-
-											#TODO Issue where if there are multiple lines that ask for number of years experience then years experience will be written twice
-											#TODO Need to add a configuration file with all the answer for these questions versus having them hardcoded.
-											#Some questions are asking how many years of experience you have in a specific skill
-											#Automatically put the number of years that I have worked.
-											elif "How many years" in text and "experience" in text:
-												textField = questionElement.find_element(By.XPATH, textInput_locator[1])
-												time.sleep(1)
-												log.info("Attempting to click the text field for %s", textInput_locator)
-												self.browser.execute_script("arguments[0].click()", textField)
-												log.info("Clicked the text field %s", textInput_locator)
-												time.sleep(1)
-												log.info("Attempting to send keys to the text field %s", textInput_locator)
-												textField.send_keys("10")
-												log.info("Sent keys to the text field %s", textInput_locator)
-
-											#This should be updated to match the language you speak.
-											elif "Do you" in text and "speak" in text:
-												if "English" in text:
-													yesRadio = questionElement.find_element(By.XPATH, yes_locator[1])
-													time.sleep(1)
-													log.info("Attempting to click the radio button for %s", yes_locator)
-													self.browser.execute_script("arguments[0].click()", yesRadio)
-													log.info("Clicked the radio button %s", yes_locator)
-												#if not english then say no.
-												else:
-													noRadio = questionElement.find_element(By.XPATH, no_locator[1])
-													time.sleep(1)
-													log.info("Attempting to click the radio button for %s", no_locator)
-													self.browser.execute_script("arguments[0].click()", noRadio)
-													log.info("Clicked the radio button %s", no_locator)
-
-											else:
-												log.warning("Unable to find question in my tiny database")
-
-										except Exception as e:
-											log.exception("Could not answer additional questions: %s", e)
-											log.error("Unable to submit due to error with no solution")
-											return submitted
-									attemptQuestions = False
-									log.info("no longer going to try and answer questions, since we have now tried")
-								else:
-									log.error("Unable to submit due to error with no solution")
-									return submitted
-
-
-					if button:
-						if button_locator == upload_locator:
-							log.info("Uploading resume now")
-
-							time.sleep(random.uniform(2.2, 4.3))
-							driver.execute_script("arguments[0].click()", button)
-
-							#TODO This can only handle Chrome right now. Firefox or other browsers will need to be handled separately
-							# Chrome opens the file browser window with the title "Open"
-							status = wsh.AppActivate("Open")
-							log.debug("Able to find file browser dialog: %s", status)
-							#Must sleep around sending the resume location so it has time to accept all keys submitted
-							time.sleep(1)
-							wsh.SendKeys(str(self.resume_loctn))
-							time.sleep(1)
-							wsh.SendKeys("{ENTER}")
-							log.info("Just finished using button %s ", button_locator)
-
-						else:
-							try:
-								log.info("attempting to click button: %s", str(button_locator))
-								response = button.click()
-								if (button_locator == submit_locator) or (button_locator == submit_application_locator):
-									log.info("Clicked the submit button.")
-									submitted = True
-									return submitted
-							except EC.StaleElementReferenceException:
-								log.warning("Button was stale. Couldnt click")
-					else:
-						if (button_locator == submit_locator) or (button_locator == submit_application_locator):
-							log.warning("Unable to submit. It appears none of the buttons were found.")
-							break
-
-
-
-			# After submitting the application, a dialog shows up, we need to close this dialog
-			close_button_locator = (By.CSS_SELECTOR, "button[aria-label='Dismiss']")
-			if is_present(close_button_locator):
-				close_button = self.wait.until(EC.element_to_be_clickable(close_button_locator))
-				close_button.click()
-
-		except Exception as e:
-			log.info(e)
-			log.warning("cannot apply to this job")
-			raise(e)
+		"""Drive the Easy Apply modal as a state machine until it is submitted or gives up.
+
+		Each step reads the whole modal state in one call, acts on it and waits
+		for the modal to change. The form is abandoned when it runs out of steps,
+		exceeds FORM_TIMEOUT or the job's budget, stops changing for MAX_STALLED
+		steps or shows an error it cannot fix; unless it was already submitted,
+		that raises FormError or JobTimedOut.
+		"""
+		log.info("Attempting to apply")
+		deadline = time.time() + self.FORM_TIMEOUT
+		submitted = False
+		failure = None
+		uploaded = set()
+		attempted = set()
+		stalled = 0
+		form = applyform.read_state(self.browser)
+
+		for step in range(self.MAX_FORM_STEPS):
+			state = form['state']
+			key = applyform.step_key(form)
+			if form['upload'] and key not in uploaded and state not in ('closed', 'done'):
+				state = 'upload'
+			elif form['unanswered'] and key not in attempted and state != 'closed':
+				state = 'questions'
+			elif state == 'done' and not submitted:
+				state = 'unknown'
+			log.info("Easy Apply step %s: %s", step, state)
+
+			if state == 'closed':
+				break
+			elif state == 'upload':
+				uploaded.add(key)
+				self.upload_files()
+			elif state == 'questions':
+				attempted.add(key)
+				if not self.answer_questions():
+					failure = FormError(f"could not answer {form['unanswered']}")
+					break
+			elif state == 'error':
+				log.warning("Warning message received: %s", form['errors'])
+				if key in attempted:
+					log.error("Unable to submit due to error with no solution")
+					failure = FormError(f"unresolved errors {form['errors']}")
+					break
+				attempted.add(key)
+				log.info("Attempting to resolve by finding test questions")
+				if not self.answer_questions():
+					failure = FormError(f"could not answer {form['unanswered']}")
+					break
+			elif state in ('next', 'review', 'submit', 'done'):
+				# the dismiss button of a sent application is not held to the job's budget either
+				self.click_form_button(state, timeout=30 if submitted else self.time_left(30))
+				if state == 'submit':
+					log.info("Clicked the submit button.")
+					submitted = True
+				elif state == 'done':
+					break
+
+			if time.time() > deadline:
+				log.warning("Easy Apply form took longer than %ss, giving up", self.FORM_TIMEOUT)
+				failure = JobTimedOut(f"form took longer than {self.FORM_TIMEOUT}s")
+				break
 
+			previous = form
+			with self.metrics.span('form_change', WAIT):
+				# a submitted application is not failed for running over the budget
+				form = applyform.wait_for_change(self.browser, previous, timeout=5 if submitted else self.time_left(5))
+			if applyform.signature(form) == applyform.signature(previous):
+				stalled += 1
+				if stalled >= self.MAX_STALLED:
+					log.warning("Easy Apply form stuck on step %s, giving up", form['state'])
+					failure = FormError(f"stuck on step {form['state']}")
+					break
+			else:
+				stalled = 0
+		else:
+			log.warning("Easy Apply form used all %s steps, giving up", self.MAX_FORM_STEPS)
+			failure = FormError(f"used all {self.MAX_FORM_STEPS} steps")
+
+		if failure is not None and not submitted:
+			raise failure
 		return submitted
 
-	def load_page(self, sleep=1):
-		scroll_page = 0
-		while scroll_page < 4000:
-			self.browser.execute_script("window.scrollTo(0," + str(scroll_page) + " );")
-			scroll_page += 200
-			time.sleep(sleep)
+	def click_form_button(self, state, timeout=30):
+		locator = (By.CSS_SELECTOR, "button[aria-label='%s']" % applyform.BUTTON_LABELS[state])
+		try:
+			log.info("attempting to click button: %s", str(locator))
+			button = WebDriverWait(self.browser, timeout).until(EC.element_to_be_clickable(locator))
+			self.pace.action()
+			with self.metrics.span('send_resume.' + state):
+				button.click()
+		except TimeoutException:
+			log.exception("Timed out waiting for button %s ", locator)
+		except StaleElementReferenceException:
+			log.warning("Button was stale. Couldnt click")
+
+	def upload_files(self):
+		"""Attach the configured uploads straight to the form's file inputs, unless already attached."""
+		log.info("Resume upload option available. Attempting to upload.")
+		for field in file_inputs(self.browser):
+			upload = match_upload(field, self.uploads)
+			if upload is None:
+				log.info("No upload configured for %s", field['label'].splitlines()[0] if field['label'] else "a file input")
+			elif upload.filename in field['attached']:
+				log.info("%s is already attached", upload.filename)
+			else:
+				log.info("Uploading %s as %s", upload.filename, upload.name)
+				self.pace.action()
+				field['input'].send_keys(upload.path)
+
+	def answer_questions(self):
+		"""Answer the questions of a modal step; returns False if answering failed.
+
+		One script call reads every field, the answers are resolved here and a
+		second call fills them all in. Fields that already have a value are left
+		alone unless they show an error.
+		"""
+		try:
+			fields = {field['index']: field for field in applyform.read_fields(self.browser)}
+			values = []
+			for field in fields.values():
+				if field['filled'] and not field['error']:
+					continue
+				log.warning("Question Text: %s", field['question'])
+				answer = self.answers.answer(field['question'])
+				if answer is None:
+					log.warning("Unable to find question in my tiny database")
+				else:
+					values.append({'index': field['index'], 'kind': field['kind'], 'value': answer})
+			if not values:
+				return True
+			self.pace.action()
+			failed = applyform.fill_fields(self.browser, values)
+			for index in failed:
+				log.warning("No option of %s matches the answer", fields[index]['question'])
+			log.info("Filled %s of %s questions", len(values) - len(failed), len(fields))
+		except WebDriverException as e:
+			log.exception("Could not answer additional questions: %s", e)
+			log.error("Unable to submit due to error with no solution")
+			return False
+		return True
 
-		if sleep != 1:
-			self.browser.execute_script("window.scrollTo(0,0);")
-			time.sleep(sleep * 3)
+	@spanned('load_page', WAIT)
+	def load_page(self, sleep=1, selector=None, count_selector=None):
+		# sleep is the per-step delay of the old fixed scroll loop, kept as the baseline for the time saved
+		readiness.wait_until_ready(self.browser,
+								   selector=selector,
+								   count_selector=count_selector,
+								   timeout=self.time_left(self.PAGE_TIMEOUT),
+								   baseline=readiness.legacy_scroll_time(sleep))
 
-		page = BeautifulSoup(self.browser.page_source, "lxml")
-		return page
+		# the page source is only transferred and parsed if something reads the snapshot
+		return PageSnapshot(lambda: self.browser.page_source)
 
 	def avoid_lock(self):
 		x, _ = pyautogui.position()
@@ -518,15 +848,53 @@ class EasyApplyBot:
 		pyautogui.keyDown('ctrl')
 		pyautogui.press('esc')
 		pyautogui.keyUp('ctrl')
-		time.sleep(0.5)
+		self.sleep(0.5)
 		pyautogui.press('esc')
 
+	def search_url(self, position, location, jobs_per_page):
+		return (self.BASE_URL + "/jobs/search/?f_LF=f_AL&keywords=" +
+				position + location + "&start="+str(jobs_per_page))
+
+	def search_cards(self, position, location, jobs_per_page):
+		"""Job cards of one results page, fetched over HTTP in http discovery mode and in the browser otherwise.
+
+		HTTP discovery falls back to the browser for the rest of the run when a
+		request fails, the session is not accepted, or the first pages come
+		back without any cards.
+		"""
+		if self.discovery == 'http':
+			try:
+				self.pace.action()
+				with self.metrics.span('http_search', WAIT):
+					cards = self.http_cards(self.search_url(position, location, jobs_per_page))
+				if cards or self.http_verified:
+					self.http_verified = True
+					return cards
+				log.warning("No job cards in the HTTP response, using the browser from now on")
+			except (LoggedOut, requests.RequestException) as e:
+				log.warning("HTTP discovery failed (%s), using the browser from now on", e)
+			self.discovery = 'browser'
+
+		self.browser, _ = self.next_jobs_page(position, location, jobs_per_page)
+		# get every job card in one call
+		with self.metrics.span('extract_cards'):
+			return jobcards.extract_cards(self.browser)
+
+	def http_cards(self, url):
+		if self.http_search is None:
+			self.http_search = HTTPSearch.from_browser(self.browser)
+		try:
+			return self.http_search.cards(url)
+		except LoggedOut:
+			# the login may have finished after the cookies were copied
+			self.http_search.load_cookies(self.browser)
+			return self.http_search.cards(url)
+
+	@spanned('next_jobs_page')
 	def next_jobs_page(self, position, location, jobs_per_page):
-		self.browser.get(
-			"https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
-			position + location + "&start="+str(jobs_per_page))
+		self.open_page(self.search_url(position, location, jobs_per_page))
 		#self.avoid_lock()
-		self.load_page()
+		self.load_page(count_selector=self.JOB_CARD_SELECTOR)
 		return (self.browser, jobs_per_page)
 
 
@@ -534,6 +902,57 @@ class EasyApplyBot:
 		self.browser.close()
 
 
+def clone_profile(profile_dir, n):
+	"""Give worker n its own copy of the browser profile; Chrome locks a profile to one process."""
+	clone = f"{profile_dir.rstrip('/')}-worker-{n}"
+	if os.path.isdir(profile_dir) and not os.path.isdir(clone):
+		shutil.copytree(profile_dir, clone,
+						ignore=shutil.ignore_patterns('Singleton*', 'lockfile', '*Cache'))
+	return clone
+
+
+def run_workers(workers, positions, locations, filename='output.csv', lookback_days=2, metrics=None, pacer=None,
+				profile_dir=None, checkpoint=None, shared=None, **kwargs):
+	"""Apply with several independent browser sessions sharing one combo queue.
+
+	Every worker logs in with its own driver; the applied job IDs and the
+	output file are shared so no two workers apply to the same job.
+	"""
+	shared = shared if shared is not None else SharedState.for_output(filename, lookback_days)
+	checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+	combos = checkpoint.schedule(shared.frontier, positions, locations)
+	metrics = metrics if metrics is not None else Metrics()
+	pacer = pacer if pacer is not None else Pacer()
+	failed = []
+
+	def work(n):
+		try:
+			bot = EasyApplyBot(filename=filename,
+							   shared=shared,
+							   metrics=metrics,
+							   pacer=pacer,
+							   profile_dir=clone_profile(profile_dir, n) if profile_dir else None,
+							   checkpoint=checkpoint,
+							   **kwargs)
+			bot.fill_data()
+			bot.apply_combos(combos)
+			bot.finish_apply()
+		except Exception:
+			failed.append(n)
+			log.exception("Worker stopped")
+
+	threads = [threading.Thread(target=work, args=(n,), name=f"worker-{n}") for n in range(workers)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	if failed:
+		log.warning("%s workers stopped early, run with --resume to continue", len(failed))
+	else:
+		checkpoint.clear()
+	metrics.summary()
+
+
 def setupLogger():
 	dt = datetime.strftime(datetime.now(), "%m_%d_%y %H_%M_%S ")
 
@@ -541,17 +960,21 @@ def setupLogger():
 		os.mkdir('./logs')
 
 	# TODO need to check if there is a log dir available or not
-	logging.basicConfig(filename=('./logs/' + str(dt)+'applyJobs.log'), filemode='w', format='%(asctime)s::%(name)s::%(levelname)s::%(message)s', datefmt='./logs/%d-%b-%y %H:%M:%S')
+	logging.basicConfig(filename=('./logs/' + str(dt)+'applyJobs.log'), filemode='w', format='%(asctime)s::%(name)s::%(threadName)s::%(levelname)s::%(message)s', datefmt='./logs/%d-%b-%y %H:%M:%S')
 	log.setLevel(logging.DEBUG)
 	c_handler = logging.StreamHandler()
 	c_handler.setLevel(logging.DEBUG)
-	c_format = logging.Formatter('%(asctime)s::%(name)s::%(levelname)s::%(lineno)d- %(message)s')
+	c_format = logging.Formatter('%(asctime)s::%(name)s::%(threadName)s::%(levelname)s::%(lineno)d- %(message)s')
 	c_handler.setFormatter(c_format)
 	log.addHandler(c_handler)
 
 
 if __name__ == '__main__':
 
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--resume', action='store_true', help="continue where the last run stopped")
+	args = parser.parse_args()
+
 	setupLogger()
 
 	with open("config.yaml", 'r') as stream:
@@ -571,18 +994,84 @@ if __name__ == '__main__':
 	output_filename = [f for f in parameters.get('output_filename', ['output.csv']) if f != None]
 	output_filename = output_filename[0] if len(output_filename) > 0 else 'output.csv'
 	blacklist = parameters.get('blacklist', [])
-	uploads = parameters.get('uploads', {})
-	for key in uploads.keys():
-		assert uploads[key] != None
+	uploads = check_uploads(parameters.get('uploads') or {})
+	workers = parameters.get('workers', 1) or 1
+	lookback_days = parameters.get('lookback_days', 2)
+	answers = AnswerBook(parameters.get('questions', []),
+						 parameters.get('answers_file', 'answers.yaml'))
+	metrics = Metrics(parameters.get('metrics_file', './logs/metrics.jsonl'),
+					  parameters.get('prometheus_file', './logs/metrics.prom'))
+	profile_dir = parameters.get('profile_dir')
+	lean = parameters.get('lean')
+	lean = {} if lean is True else lean or None
+	recycle = RecyclePolicy(**(parameters.get('recycle') or {}))
+	job_filter = JobFilter(blacklist,
+						   title_include=parameters.get('title_include'),
+						   title_exclude=parameters.get('title_exclude'),
+						   require_easy_apply=parameters.get('require_easy_apply', True))
+	checkpoint = Checkpoint(parameters.get('checkpoint_file', './logs/checkpoint.json'))
+	if args.resume:
+		checkpoint.restore()
+	coordinator = parameters.get('coordinator') or {}
+	ledger = None
+	if coordinator.get('ledger_file'):
+		# a resumed run claims as the run it continues, so its unfinished claims are not locked out
+		ledger = ClaimLedger(coordinator['ledger_file'],
+							 lease_seconds=coordinator.get('lease_seconds', 600),
+							 combo_hold_hours=coordinator.get('combo_hold_hours', 12),
+							 owner=checkpoint.owner)
+		checkpoint.owner = ledger.owner
+	shared = SharedState.for_output(output_filename, lookback_days, parameters.get('output'), ledger,
+									parameters.get('dedup'))
+	pacer = Pacer(**(parameters.get('pacing') or {}), history=shared.store)
 
+	locations = [l for l in parameters['locations'] if l != None]
+	positions = [p for p in parameters['positions'] if p != None]
 
-	bot = EasyApplyBot(parameters['username'],
-						parameters['password'],
+	try:
+		if workers > 1:
+			run_workers(workers,
+						positions,
+						locations,
+						username=parameters['username'],
+						password=parameters['password'],
 						uploads=uploads,
 						filename=output_filename,
-						blacklist=blacklist
+						blacklist=blacklist,
+						lookback_days=lookback_days,
+						answers=answers,
+						metrics=metrics,
+						pacer=pacer,
+						profile_dir=profile_dir,
+						lean=lean,
+						job_filter=job_filter,
+						checkpoint=checkpoint,
+						shared=shared,
+						recycle=recycle,
+						job_timeout=parameters.get('job_timeout'),
+						ranker=RelevanceRanker.from_config(parameters.get('relevance')),
+						discovery=parameters.get('discovery') or 'browser'
 						)
-
-	locations = [l for l in parameters['locations'] if l != None]
-	positions = [p for p in parameters['positions'] if p != None]
-	bot.start_apply(positions, locations)
+		else:
+			bot = EasyApplyBot(parameters['username'],
+								parameters['password'],
+								uploads=uploads,
+								filename=output_filename,
+								blacklist=blacklist,
+								lookback_days=lookback_days,
+								answers=answers,
+								metrics=metrics,
+								pacer=pacer,
+								profile_dir=profile_dir,
+								lean=lean,
+								job_filter=job_filter,
+								checkpoint=checkpoint,
+								shared=shared,
+								recycle=recycle,
+								job_timeout=parameters.get('job_timeout'),
+								ranker=RelevanceRanker.from_config(parameters.get('relevance')),
+								discovery=parameters.get('discovery') or 'browser'
+								)
+			bot.start_apply(positions, locations)
+	finally:
+		shared.close()
@@ -4,7 +4,6 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
 import pyautogui
 from tkinter import filedialog, Tk
 import tkinter.messagebox as tm
@@ -12,12 +11,15 @@ import os
 from urllib.request import urlopen
 
 import login_v06
+import readiness
+from pagesnapshot import PageSnapshot, has_class
 
 # pyinstaller --onefile --windowed --icon=app.ico easyapplybot_v06.3.py
 
 class EasyApplyBot:
 
     MAX_APPLICATIONS = 3000
+    PAGE_TIMEOUT = 15
 
     def __init__(self,username,password, language, position, location, resumeloctn):
 
@@ -129,7 +131,7 @@ class EasyApplyBot:
             # sleep to make sure everything loads, add random to make us look human.
             time.sleep(random.uniform(3.5, 6.9))
 
-            page = BeautifulSoup(self.browser.page_source, 'lxml')
+            page = PageSnapshot(self.browser.page_source)
 
             jobs = self.get_job_links(page)
 
@@ -164,41 +166,25 @@ class EasyApplyBot:
         self.finish_apply()
 
     def get_job_links(self, page):
-        links = []
-        for link in page.find_all('a'):
-            url = link.get('href')
-            #url2 = link['href']
-            #print(url)
-            #print(page)
-            if url:
-                if '/jobs/view' in url:
-                    links.append(url)
-        return set(links)
+        return set(page.links('/jobs/view'))
 
     def get_job_page(self, job):
         root = 'www.linkedin.com'
         if root not in job:
             job = 'https://www.linkedin.com'+job
         self.browser.get(job)
-        self.job_page = self.load_page(sleep=0.5)
+        self.job_page = self.load_page(sleep=0.5, selector="button.jobs-s-apply__button")
         return self.job_page
 
     def got_easy_apply(self, page):
-        button = page.find("button", class_="jobs-s-apply__button ember-view")
-        return len(str(button)) > 4
+        return page.exists("//button[%s]" % has_class("jobs-s-apply__button", "ember-view"))
 
     def get_easy_apply_button(self):
-        button_class = "jobs-s-apply--top-card jobs-s-apply--fadein inline-flex mr1 jobs-s-apply ember-view"
-        button = self.job_page.find("div", class_=button_class)
-        return button
+        return self.job_page.first("//div[%s]" % has_class("jobs-s-apply--top-card", "jobs-s-apply", "ember-view"))
 
     def easy_apply_xpath(self):
         button = self.get_easy_apply_button()
-        button_inner_html = str(button)
-        list_of_words = button_inner_html.split()
-        next_word = [word for word in list_of_words if "ember" in word and "id" in word]
-        ember = next_word[0][:-1]
-        xpath = '//*[@'+ember+']/button'
+        xpath = '//*[@id="' + button.get('id') + '"]/button'
         return xpath
 
     def click_button(self, xpath):
@@ -221,19 +207,15 @@ class EasyApplyBot:
         submit_button.click()
         time.sleep(random.uniform(1.5, 2.5))
 
-    def load_page(self, sleep=1):
-        scroll_page = 0
-        while scroll_page < 4000:
-            self.browser.execute_script("window.scrollTo(0,"+str(scroll_page)+" );")
-            scroll_page += 200
-            time.sleep(sleep)
+    def load_page(self, sleep=1, selector=None, count_selector=None):
+        waited, reason = readiness.wait_until_ready(self.browser,
+                                                    selector=selector,
+                                                    count_selector=count_selector,
+                                                    timeout=self.PAGE_TIMEOUT)
+        saved = readiness.legacy_scroll_time(sleep) - waited
+        print(f"Page ready ({reason}) in {waited:.1f}s, saved {saved:.1f}s")
 
-        if sleep != 1:
-            self.browser.execute_script("window.scrollTo(0,0);")
-            time.sleep(sleep * 3)
-
-        page = BeautifulSoup(self.browser.page_source, "lxml")
-        return page
+        return PageSnapshot(lambda: self.browser.page_source)
 
     def avoid_lock(self):
         x, _ = pyautogui.position()
@@ -250,7 +232,7 @@ class EasyApplyBot:
             "https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
             self.position + self.location + "&start="+str(jobs_per_page))
         self.avoid_lock()
-        self.load_page()
+        self.load_page(count_selector="a[href*='/jobs/view']")
         return (self.browser, jobs_per_page)
 
     def finish_apply(self):
@@ -0,0 +1,37 @@
+"""Why a job failed, so failures can be counted and recorded instead of stopping the run."""
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+BROWSER_GONE = ('invalid session id', 'chrome not reachable', 'disconnected', 'no such window')
+
+
+class JobFailed(Exception):
+	kind = 'error'
+
+
+class JobTimedOut(JobFailed):
+	"""The job used up its time budget."""
+	kind = 'timeout'
+
+
+class FormError(JobFailed):
+	"""The Easy Apply form could not be completed."""
+	kind = 'form_error'
+
+
+class Redirected(JobFailed):
+	"""Applying left LinkedIn, or opened another tab."""
+	kind = 'redirect'
+
+
+def classify(error):
+	"""One of timeout, stale_element, form_error, redirect, browser_crash, webdriver or error."""
+	if isinstance(error, JobFailed):
+		return error.kind
+	if isinstance(error, TimeoutException):
+		return 'timeout'
+	if isinstance(error, StaleElementReferenceException):
+		return 'stale_element'
+	if isinstance(error, WebDriverException):
+		message = (error.msg or '').lower()
+		return 'browser_crash' if any(marker in message for marker in BROWSER_GONE) else 'webdriver'
+	return 'error'
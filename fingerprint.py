@@ -0,0 +1,117 @@
+"""Recognise reposted jobs by their content, since a repost gets a new job ID."""
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from jobfilter import normalize_company
+from ranking import tokenize
+
+log = logging.getLogger(__name__)
+
+BITS = 64
+MASK = (1 << BITS) - 1
+BRACKETS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+NON_WORD = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize(text):
+	"""Lower case words without punctuation or bracketed notes such as '(Remote)'."""
+	return " ".join(NON_WORD.sub(" ", BRACKETS.sub(" ", (text or "").lower())).split())
+
+
+def simhash(text, shingle=3, min_tokens=20):
+	"""64-bit SimHash of the word shingles of a text, or None when the text is too short to tell."""
+	tokens = tokenize(text)
+	if len(tokens) < min_tokens:
+		return None
+	votes = [0] * BITS
+	for i in range(len(tokens) - shingle + 1):
+		digest = hashlib.blake2b(" ".join(tokens[i:i + shingle]).encode(), digest_size=8).digest()
+		value = int.from_bytes(digest, 'little')
+		for bit in range(BITS):
+			votes[bit] += 1 if value >> bit & 1 else -1
+	return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+def distance(a, b):
+	return bin((a ^ b) & MASK).count('1')
+
+
+class FingerprintIndex:
+	"""Title, company, location and description SimHash of every job applied to.
+
+	A job card with the same normalized title, company and location as an
+	application inside the window is a repost. Once the job page is open, a
+	description within `max_distance` bits of an earlier application's at
+	the same company is one too, which also catches the same role posted in
+	several locations or under a reworded title.
+	"""
+
+	def __init__(self, path, window_days=30, max_distance=3):
+		self.window_days = window_days
+		self.max_distance = max_distance
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+		self.db.executescript("""
+			CREATE TABLE IF NOT EXISTS fingerprints (
+				job_id INTEGER PRIMARY KEY,
+				title TEXT NOT NULL,
+				company TEXT NOT NULL,
+				location TEXT NOT NULL,
+				simhash INTEGER,
+				recorded_at REAL NOT NULL
+			);
+			CREATE INDEX IF NOT EXISTS fingerprints_company_idx ON fingerprints (company, recorded_at);
+		""")
+
+	def cutoff(self):
+		if self.window_days is None:
+			return 0
+		return time.time() - self.window_days * 24 * 60 * 60
+
+	def earlier(self, card):
+		company = normalize_company(card.get('company'))
+		if not company:
+			# jobs without a company name would all be compared with each other
+			return []
+		with self.lock:
+			return self.db.execute(
+				"SELECT job_id, title, location, simhash, recorded_at FROM fingerprints "
+				"WHERE company = ? AND recorded_at > ? AND job_id != ?",
+				(company, self.cutoff(), int(card['jobID']))).fetchall()
+
+	def match(self, card, description=None):
+		"""The earlier application a job duplicates, as a short description, or None.
+
+		Without a description only the title, company and location are compared.
+		"""
+		title, location = normalize(card.get('title')), normalize(card.get('location'))
+		fingerprint = simhash(description) if description else None
+		for jobID, other_title, other_location, other_hash, recorded_at in self.earlier(card):
+			if other_title == title and other_location == location:
+				why = "same title, company and location"
+			elif fingerprint is not None and other_hash is not None \
+					and distance(fingerprint, other_hash & MASK) <= self.max_distance:
+				why = f"description {distance(fingerprint, other_hash & MASK)} bits from it"
+			else:
+				continue
+			return f"repost of {jobID} applied {datetime.fromtimestamp(recorded_at):%Y-%m-%d} ({why})"
+		return None
+
+	def add(self, card, description=None, timestamp=None):
+		timestamp = time.time() if timestamp is None else timestamp
+		fingerprint = simhash(description) if description else None
+		if fingerprint is not None and fingerprint > MASK >> 1:
+			# SQLite integers are signed
+			fingerprint -= 1 << BITS
+		with self.lock, self.db:
+			self.db.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)",
+							(int(card['jobID']), normalize(card.get('title')), normalize_company(card.get('company')),
+							 normalize(card.get('location')), fingerprint, timestamp))
+
+	def close(self):
+		self.db.close()
@@ -0,0 +1,89 @@
+"""Schedule (position, location) searches by how many applications they produced before."""
+import logging
+import queue
+import random
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class SearchFrontier:
+	"""Per-combo and per-page yield statistics kept across runs.
+
+	Combos are ranked by smoothed applications per minute, so a combo that was
+	never run starts from PRIOR_APPLICATIONS / PRIOR_MINUTES and gets tried
+	before combos that are known to be poor. A combo whose last run found no
+	new jobs goes to the back of the queue for EXHAUSTED_HOURS.
+	"""
+
+	PRIOR_APPLICATIONS = 1
+	PRIOR_MINUTES = 5
+	EXHAUSTED_HOURS = 24
+
+	def __init__(self, path):
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, check_same_thread=False)
+		self.db.executescript("""
+			CREATE TABLE IF NOT EXISTS search_stats (
+				position TEXT NOT NULL,
+				location TEXT NOT NULL,
+				page INTEGER NOT NULL,
+				runs INTEGER NOT NULL DEFAULT 0,
+				jobs INTEGER NOT NULL DEFAULT 0,
+				applications INTEGER NOT NULL DEFAULT 0,
+				seconds REAL NOT NULL DEFAULT 0,
+				last_run REAL,
+				last_jobs INTEGER,
+				PRIMARY KEY (position, location, page)
+			);
+		""")
+
+	def combo_stats(self):
+		with self.lock:
+			rows = self.db.execute("""
+				SELECT position, location, SUM(applications), SUM(seconds), MAX(last_run),
+					SUM(CASE WHEN last_run = (SELECT MAX(last_run) FROM search_stats s
+						WHERE s.position = search_stats.position AND s.location = search_stats.location)
+						THEN last_jobs ELSE 0 END)
+				FROM search_stats GROUP BY position, location
+			""").fetchall()
+		return {(position, location): (applications, seconds, last_run, last_jobs)
+				for position, location, applications, seconds, last_run, last_jobs in rows}
+
+	def score(self, stats):
+		"""Sort key: combos that still have jobs first, then smoothed applications per minute."""
+		if stats is None:
+			return True, self.PRIOR_APPLICATIONS / self.PRIOR_MINUTES
+		applications, seconds, last_run, last_jobs = stats
+		exhausted = last_jobs == 0 and time.time() - last_run < self.EXHAUSTED_HOURS * 60 * 60
+		return not exhausted, (applications + self.PRIOR_APPLICATIONS) / (seconds / 60 + self.PRIOR_MINUTES)
+
+	def schedule(self, positions, locations):
+		"""Queue every combo once, highest expected yield first."""
+		stats = self.combo_stats()
+		combos = [(position, location) for position in positions for location in locations]
+		random.shuffle(combos)
+		combos.sort(key=lambda combo: self.score(stats.get(combo)), reverse=True)
+		scheduled = queue.Queue()
+		for combo in combos:
+			log.debug("Scheduled %s: %s with score %s", combo[0], combo[1], self.score(stats.get(combo)))
+			scheduled.put(combo)
+		return scheduled
+
+	def record(self, position, location, pages):
+		"""Add one run's results; `pages` maps page offset to [jobs, applications, seconds]."""
+		now = time.time()
+		with self.lock, self.db:
+			for page, (jobs, applications, seconds) in pages.items():
+				self.db.execute("""
+					INSERT INTO search_stats VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+					ON CONFLICT (position, location, page) DO UPDATE SET
+						runs = runs + 1,
+						jobs = jobs + excluded.jobs,
+						applications = applications + excluded.applications,
+						seconds = seconds + excluded.seconds,
+						last_run = excluded.last_run,
+						last_jobs = excluded.last_jobs
+				""", (position, location, page, jobs, applications, seconds, now, jobs))
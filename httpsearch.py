@@ -0,0 +1,61 @@
+"""Fetch search result pages over plain HTTP with the browser's session cookies."""
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import jobcards
+
+log = logging.getLogger(__name__)
+
+# URL parts of the pages LinkedIn sends a visitor without a valid session to
+LOGGED_OUT_MARKERS = ('/login', '/authwall', '/uas/', '/checkpoint')
+
+
+class LoggedOut(Exception):
+	"""The site answered with its login page instead of results."""
+
+
+class HTTPSearch:
+	"""A keep-alive requests session that reads job cards from result pages with lxml.
+
+	Cookies and the user agent are copied from the logged-in browser, so the
+	requests belong to the same session. Connections are pooled and reused
+	for every page.
+	"""
+
+	TIMEOUT = 15
+
+	def __init__(self, pool_size=4, user_agent=None):
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+		self.session.mount('https://', adapter)
+		self.session.mount('http://', adapter)
+		if user_agent:
+			self.session.headers['User-Agent'] = user_agent
+		self.session.headers['Accept'] = 'text/html,application/xhtml+xml'
+
+	@classmethod
+	def from_browser(cls, browser, pool_size=4):
+		search = cls(pool_size, browser.execute_script("return navigator.userAgent;"))
+		search.load_cookies(browser)
+		return search
+
+	def load_cookies(self, browser):
+		"""Take over the browser's cookies, after a login or a browser restart."""
+		self.session.cookies.clear()
+		for cookie in browser.get_cookies():
+			self.session.cookies.set(cookie['name'], cookie['value'],
+									 domain=cookie.get('domain'), path=cookie.get('path', '/'))
+		log.info("HTTP search uses %s cookies from the browser", len(self.session.cookies))
+
+	def cards(self, url):
+		"""Job cards on one results page; raises LoggedOut or a requests exception."""
+		response = self.session.get(url, timeout=self.TIMEOUT)
+		response.raise_for_status()
+		if any(marker in response.url for marker in LOGGED_OUT_MARKERS):
+			raise LoggedOut(response.url)
+		return jobcards.parse_cards(response.text)
+
+	def close(self):
+		self.session.close()
@@ -0,0 +1,71 @@
+"""Extract job cards from a search results page in a single WebDriver call, or from its HTML."""
+import lxml.html
+
+from pagesnapshot import has_class
+
+# Collects every card on the page as a plain record so filtering and dedup
+# can run in Python without another round trip per card or per link.
+CARDS_SCRIPT = """
+function text(card, selector) {
+	var el = card.querySelector(selector);
+	return el ? el.innerText.trim() : '';
+}
+return Array.from(document.querySelectorAll('div[data-job-id]')).map(function (card) {
+	return {
+		jobID: card.getAttribute('data-job-id'),
+		title: text(card, '.job-card-list__title, a[data-control-name="job_card_title"], a[href*="/jobs/view"]'),
+		company: text(card, '.job-card-container__company-name, .job-card-container__primary-description, a[data-control-name="job_card_company_link"]'),
+		location: text(card, '.job-card-container__metadata-item, .job-card-container__metadata-wrapper li'),
+		easyApply: /Easy Apply/i.test(card.innerText),
+		links: Array.from(card.querySelectorAll('a[data-control-name]')).map(function (a) {
+			return a.innerText.trim();
+		})
+	};
+});
+"""
+
+
+def parse_job_id(value):
+	"""Job IDs come as '12345' or 'urn:li:fs_normalized_jobPosting:12345'."""
+	return int(str(value).split(":")[-1])
+
+
+def extract_cards(browser):
+	"""Return one dict per job card: jobID, title, company, location, easyApply and links."""
+	cards = []
+	for card in browser.execute_script(CARDS_SCRIPT) or []:
+		try:
+			card['jobID'] = parse_job_id(card['jobID'])
+		except (TypeError, ValueError):
+			continue
+		cards.append(card)
+	return cards
+
+
+# the same fields as CARDS_SCRIPT, for result pages fetched without a browser
+CARD_FIELDS = {
+	'title': f".//*[{has_class('job-card-list__title')} or @data-control-name='job_card_title'"
+			 f" or {has_class('base-search-card__title')}]",
+	'company': f".//*[{has_class('job-card-container__company-name')} or @data-control-name='job_card_company_link'"
+			   f" or {has_class('base-search-card__subtitle')}]",
+	'location': f".//*[{has_class('job-card-container__metadata-item')} or {has_class('job-search-card__location')}]",
+}
+
+
+def parse_cards(html):
+	"""Job cards from the HTML of a results page, parsed with lxml; the same dicts as `extract_cards`."""
+	tree = lxml.html.fromstring(html or "<html></html>")
+	cards = []
+	for card in tree.xpath("//*[@data-job-id or starts-with(@data-entity-urn, 'urn:li:jobPosting:')]"):
+		try:
+			jobID = parse_job_id(card.get('data-job-id') or card.get('data-entity-urn'))
+		except (TypeError, ValueError):
+			continue
+		record = {'jobID': jobID}
+		for field, expression in CARD_FIELDS.items():
+			found = card.xpath(expression)
+			record[field] = found[0].text_content().strip() if found else ''
+		record['easyApply'] = 'easy apply' in card.text_content().lower()
+		record['links'] = [a.text_content().strip() for a in card.xpath(".//a[@data-control-name]")]
+		cards.append(record)
+	return cards
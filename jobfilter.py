@@ -0,0 +1,51 @@
+"""Decide from search-card data alone whether a job is worth opening."""
+import re
+
+COMPANY_SUFFIXES = frozenset("inc llc ltd limited corp corporation co gmbh plc sa ag bv group".split())
+
+
+def normalize_company(name):
+	"""Lower-case, drop punctuation and trailing legal suffixes: "Acme Group, Inc." -> "acme".
+
+	Suffixes are only dropped from the end and the first word is always kept,
+	so "AG Consulting" and "Corp" stay as they are.
+	"""
+	words = re.sub(r"[^\w\s]", " ", (name or "").lower()).split()
+	while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+		words.pop()
+	return " ".join(words)
+
+
+def compile_patterns(patterns):
+	"""Join keywords or regexes into one case-insensitive pattern, or None when there are none."""
+	patterns = [p for p in patterns or [] if p]
+	if not patterns:
+		return None
+	return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+class JobFilter:
+	"""Blacklist, title keyword and Easy Apply checks, compiled once per run."""
+
+	def __init__(self, blacklist=None, title_include=None, title_exclude=None, require_easy_apply=True):
+		self.blacklist = {normalize_company(name) for name in blacklist or [] if name} - {""}
+		self.title_include = compile_patterns(title_include)
+		self.title_exclude = compile_patterns(title_exclude)
+		self.require_easy_apply = require_easy_apply
+
+	def reason(self, card):
+		"""Return why a card should be skipped, or None if the job should be opened."""
+		if self.require_easy_apply and not card.get('easyApply'):
+			return "no Easy Apply"
+		if self.blacklist:
+			for text in [card.get('company')] + card.get('links', []):
+				if normalize_company(text) in self.blacklist:
+					return f"blacklisted: {text}"
+		title = card.get('title') or ""
+		if self.title_include and not self.title_include.search(title):
+			return "title not included"
+		if self.title_exclude:
+			match = self.title_exclude.search(title)
+			if match:
+				return f"title excluded: {match.group(0)}"
+		return None
@@ -0,0 +1,102 @@
+"""Persistent index of the jobs the bot has already processed."""
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+
+class AppliedJobStore:
+	"""SQLite backed set of job IDs with the time each one was recorded.
+
+	The output CSV is imported once; afterwards every processed job is
+	appended with `add`. Only jobs inside the lookback window (in days, None
+	for the whole history) count as applied.
+	"""
+
+	def __init__(self, path, lookback_days=2):
+		self.path = path
+		self.lookback_days = lookback_days
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, check_same_thread=False)
+		self.db.executescript("""
+			CREATE TABLE IF NOT EXISTS applied (job_id INTEGER PRIMARY KEY, applied_at REAL NOT NULL);
+			CREATE INDEX IF NOT EXISTS applied_at_idx ON applied (applied_at);
+			CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+			CREATE TABLE IF NOT EXISTS applications (submitted_at REAL PRIMARY KEY);
+		""")
+
+	@classmethod
+	def for_output(cls, filename, lookback_days=2):
+		"""Open the store that sits next to an output CSV, importing the CSV on first use."""
+		store = cls(os.path.splitext(filename)[0] + '.db', lookback_days)
+		store.import_csv(filename)
+		return store
+
+	def cutoff(self):
+		if self.lookback_days is None:
+			return 0
+		return time.time() - self.lookback_days * 24 * 60 * 60
+
+	def import_csv(self, filename):
+		key = 'imported:' + os.path.abspath(filename)
+		with self.lock:
+			if self.db.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+				return
+			rows = []
+			try:
+				with open(filename, newline='', encoding='utf-8') as f:
+					for row in csv.reader(f):
+						try:
+							rows.append((int(row[1]), datetime.fromisoformat(row[0]).timestamp()))
+						except (IndexError, ValueError):
+							continue
+			except FileNotFoundError:
+				pass
+			with self.db:
+				self.db.executemany(
+					"INSERT INTO applied VALUES (?, ?) "
+					"ON CONFLICT(job_id) DO UPDATE SET applied_at = MAX(applied_at, excluded.applied_at)",
+					rows)
+				self.db.execute("INSERT INTO meta VALUES (?, ?)", (key, datetime.now().isoformat()))
+		log.info("Imported %s jobIDs from %s", len(rows), filename)
+
+	def recent_ids(self):
+		with self.lock:
+			rows = self.db.execute("SELECT job_id FROM applied WHERE applied_at > ?", (self.cutoff(),))
+			jobIDs = {row[0] for row in rows}
+		log.info(f"{len(jobIDs)} jobIDs found")
+		return jobIDs
+
+	def add(self, jobID, timestamp=None):
+		timestamp = time.time() if timestamp is None else timestamp
+		with self.lock, self.db:
+			self.db.execute("INSERT OR REPLACE INTO applied VALUES (?, ?)", (int(jobID), timestamp))
+
+	def application_times(self, since):
+		"""Times of the application slots taken after `since`, oldest first, for the pacing caps."""
+		with self.lock:
+			rows = self.db.execute("SELECT submitted_at FROM applications WHERE submitted_at > ? ORDER BY submitted_at",
+								   (since,))
+			return [row[0] for row in rows]
+
+	def add_application(self, timestamp):
+		with self.lock, self.db:
+			self.db.execute("INSERT OR IGNORE INTO applications VALUES (?)", (timestamp,))
+
+	def remove_application(self, timestamp):
+		with self.lock, self.db:
+			self.db.execute("DELETE FROM applications WHERE submitted_at = ?", (timestamp,))
+
+	def __contains__(self, jobID):
+		with self.lock:
+			row = self.db.execute("SELECT 1 FROM applied WHERE job_id = ? AND applied_at > ?",
+								  (int(jobID), self.cutoff())).fetchone()
+		return row is not None
+
+	def close(self):
+		self.db.close()
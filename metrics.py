@@ -0,0 +1,195 @@
+"""Timing spans and WebDriver call counts for the application loop."""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Span kinds: time spent on purpose to look human, time waiting for pages,
+# and everything else, which counts as bot overhead.
+DELAY = 'delay'
+WAIT = 'wait'
+OVERHEAD = 'overhead'
+
+
+def spanned(name, kind=OVERHEAD):
+	"""Decorate a bot method so each call is recorded as a span on `self.metrics`."""
+	def decorate(method):
+		@functools.wraps(method)
+		def wrapper(self, *args, **kwargs):
+			with self.metrics.span(name, kind):
+				return method(self, *args, **kwargs)
+		return wrapper
+	return decorate
+
+
+class Metrics:
+	"""Collect spans per phase, WebDriver commands per job, and export them.
+
+	Every finished span and job is appended to a JSONL file; `write_prometheus`
+	dumps the aggregates in the Prometheus text format.
+	"""
+
+	def __init__(self, filename=None, prometheus_file=None):
+		self.filename = filename
+		self.prometheus_file = prometheus_file
+		self.started = time.time()
+		self.lock = threading.Lock()
+		self.local = threading.local()
+		self.durations = defaultdict(list)
+		self.values = defaultdict(list)
+		self.kinds = {}
+		self.commands = 0
+		self.command_time = 0.0
+		self.jobs = 0
+		self.threads = set()
+		if filename and os.path.dirname(filename):
+			os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+	def event(self, record):
+		if not self.filename:
+			return
+		record['ts'] = round(time.time(), 3)
+		record['thread'] = threading.current_thread().name
+		with self.lock, open(self.filename, 'a', encoding='utf-8') as f:
+			f.write(json.dumps(record) + "\n")
+
+	@contextmanager
+	def span(self, name, kind=OVERHEAD):
+		start = time.time()
+		try:
+			yield
+		finally:
+			duration = time.time() - start
+			with self.lock:
+				self.durations[name].append(duration)
+				self.kinds[name] = kind
+				self.threads.add(threading.current_thread().name)
+			job = getattr(self.local, 'job', None)
+			if job is not None and kind != OVERHEAD:
+				job[kind] += duration
+			self.event({'type': 'span', 'name': name, 'kind': kind, 'duration': round(duration, 4),
+						'jobID': job and job['jobID']})
+
+	def observe(self, name, value):
+		"""Record a measurement such as bytes transferred, attached to the current job."""
+		if value is None:
+			return
+		with self.lock:
+			self.values[name].append(value)
+		job = getattr(self.local, 'job', None)
+		if job is not None:
+			job['values'][name] = job['values'].get(name, 0) + value
+
+	@contextmanager
+	def job(self, jobID):
+		"""Attribute spans and WebDriver commands issued inside the block to one job."""
+		job = self.local.job = {'jobID': jobID, 'commands': 0, 'command_time': 0.0, DELAY: 0.0, WAIT: 0.0,
+								'values': {}}
+		start = time.time()
+		try:
+			yield job
+		finally:
+			self.local.job = None
+			duration = time.time() - start
+			with self.lock:
+				self.jobs += 1
+			self.event({'type': 'job', 'jobID': jobID, 'duration': round(duration, 3),
+						'commands': job['commands'], 'command_time': round(job['command_time'], 3),
+						DELAY: round(job[DELAY], 3), WAIT: round(job[WAIT], 3),
+						OVERHEAD: round(max(duration - job[DELAY] - job[WAIT], 0.0), 3), **job['values']})
+			self.write_prometheus()
+
+	def instrument(self, browser):
+		"""Count and time every command the driver sends to chromedriver."""
+		execute = browser.execute
+
+		def timed_execute(driver_command, params=None):
+			start = time.time()
+			try:
+				return execute(driver_command, params)
+			finally:
+				duration = time.time() - start
+				with self.lock:
+					self.commands += 1
+					self.command_time += duration
+				job = getattr(self.local, 'job', None)
+				if job is not None:
+					job['commands'] += 1
+					job['command_time'] += duration
+
+		browser.execute = timed_execute
+		return browser
+
+	def breakdown(self):
+		"""Split wall time into intended delay, page-load waiting and bot overhead.
+
+		With several workers the wall time is counted once per worker thread.
+		"""
+		with self.lock:
+			totals = defaultdict(float)
+			for name, durations in self.durations.items():
+				totals[self.kinds[name]] += sum(durations)
+			wall = (time.time() - self.started) * max(len(self.threads), 1)
+		return {
+			'wall': wall,
+			DELAY: totals[DELAY],
+			WAIT: totals[WAIT],
+			OVERHEAD: max(wall - totals[DELAY] - totals[WAIT], 0.0),
+		}
+
+	def summary(self):
+		breakdown = self.breakdown()
+		wall = breakdown['wall'] or 1
+		log.info("Wall time %.0fs over %s jobs: %.0f%% human-like delay, %.0f%% waiting on pages, %.0f%% bot overhead",
+				 breakdown['wall'], self.jobs, 100 * breakdown[DELAY] / wall,
+				 100 * breakdown[WAIT] / wall, 100 * breakdown[OVERHEAD] / wall)
+		with self.lock:
+			phases = sorted(self.durations.items(), key=lambda item: -sum(item[1]))
+		for name, durations in phases:
+			log.info("  %-20s %-8s %6d calls %9.1fs total %7.2fs mean",
+					 name, self.kinds[name], len(durations), sum(durations), sum(durations) / len(durations))
+		if self.jobs:
+			log.info("  %.1f WebDriver commands per job", self.commands / self.jobs)
+		with self.lock:
+			values = sorted(self.values.items())
+		for name, samples in values:
+			log.info("  %-20s %9.1f mean over %s pages", name, sum(samples) / len(samples), len(samples))
+		self.write_prometheus()
+		return breakdown
+
+	def write_prometheus(self):
+		if not self.prometheus_file:
+			return
+		lines = [
+			"# HELP easyapply_phase_seconds Time spent per phase of the application loop.",
+			"# TYPE easyapply_phase_seconds summary",
+		]
+		with self.lock:
+			for name, durations in sorted(self.durations.items()):
+				labels = f'phase="{name}",kind="{self.kinds[name]}"'
+				lines.append(f"easyapply_phase_seconds_sum{{{labels}}} {sum(durations):.6f}")
+				lines.append(f"easyapply_phase_seconds_count{{{labels}}} {len(durations)}")
+			lines += [
+				"# HELP easyapply_webdriver_commands_total WebDriver commands sent.",
+				"# TYPE easyapply_webdriver_commands_total counter",
+				f"easyapply_webdriver_commands_total {self.commands}",
+				"# HELP easyapply_webdriver_seconds_total Time spent in WebDriver commands.",
+				"# TYPE easyapply_webdriver_seconds_total counter",
+				f"easyapply_webdriver_seconds_total {self.command_time:.6f}",
+				"# HELP easyapply_jobs_total Jobs processed.",
+				"# TYPE easyapply_jobs_total counter",
+				f"easyapply_jobs_total {self.jobs}",
+				"# HELP easyapply_page_value Per-page measurements such as bytes transferred.",
+				"# TYPE easyapply_page_value summary",
+			]
+			for name, samples in sorted(self.values.items()):
+				lines.append(f'easyapply_page_value_sum{{name="{name}"}} {sum(samples)}')
+				lines.append(f'easyapply_page_value_count{{name="{name}"}} {len(samples)}')
+		with open(self.prometheus_file, 'w', encoding='utf-8') as f:
+			f.write("\n".join(lines) + "\n")
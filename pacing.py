@@ -0,0 +1,121 @@
+"""Central pacing for the actions a recruiter could see the bot take."""
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class Pacer:
+	"""Action rate, jitter and application caps shared by every session of a run.
+
+	Only user-visible actions (navigations, clicks, key presses) are paced, and
+	time the bot already spent working since the previous action counts
+	towards the gap, so locator probing and page loads add no extra delay.
+
+	With a `history` (the applied job store), application slots are also
+	saved there and the caps count every run and process using it.
+	"""
+
+	def __init__(self,
+				 actions_per_minute=18,
+				 jitter='uniform',
+				 jitter_amount=0.33,
+				 hourly_cap=None,
+				 daily_cap=None,
+				 break_every=20,
+				 break_seconds=(500, 900),
+				 history=None):
+		self.mean_gap = 60.0 / actions_per_minute
+		self.jitter = jitter
+		self.jitter_amount = jitter_amount
+		self.hourly_cap = hourly_cap
+		self.daily_cap = daily_cap
+		self.break_every = break_every
+		self.break_seconds = break_seconds
+		self.history = history
+		self.lock = threading.Lock()
+		self.applications = deque()
+
+	def gap(self):
+		"""Draw the pause between two actions from the configured distribution."""
+		if self.jitter == 'gaussian':
+			return max(0.0, random.gauss(self.mean_gap, self.mean_gap * self.jitter_amount))
+		if self.jitter == 'lognormal':
+			sigma = self.jitter_amount
+			return random.lognormvariate(math.log(self.mean_gap) - sigma ** 2 / 2, sigma)
+		return random.uniform(self.mean_gap * (1 - self.jitter_amount), self.mean_gap * (1 + self.jitter_amount))
+
+	def capacity_wait(self, now):
+		"""Seconds until another application fits under the hourly and daily caps."""
+		while self.applications and self.applications[0] <= now - 24 * 60 * 60:
+			self.applications.popleft()
+		wait = 0.0
+		for cap, window in ((self.hourly_cap, 60 * 60), (self.daily_cap, 24 * 60 * 60)):
+			recent = [t for t in self.applications if t > now - window]
+			if cap and len(recent) >= cap:
+				wait = max(wait, recent[-cap] + window - now)
+		return wait
+
+	def reserve(self, sleep):
+		"""Block until the caps allow another application and count it; returns its slot."""
+		while True:
+			with self.lock:
+				now = time.time()
+				if self.history is not None:
+					self.applications = deque(self.history.application_times(now - 24 * 60 * 60))
+				wait = self.capacity_wait(now)
+				if wait <= 0:
+					self.applications.append(now)
+					if self.history is not None:
+						self.history.add_application(now)
+					return now
+			log.warning("Application cap reached, waiting %.0f min", wait / 60)
+			sleep(wait)
+
+	def release(self, slot):
+		with self.lock:
+			try:
+				self.applications.remove(slot)
+			except ValueError:
+				pass
+			if self.history is not None:
+				self.history.remove_application(slot)
+
+	def session(self, sleep):
+		return PaceSession(self, sleep)
+
+
+class PaceSession:
+	"""Pacing state of one browser session; `sleep` performs the actual delay."""
+
+	def __init__(self, pacer, sleep):
+		self.pacer = pacer
+		self.sleep = sleep
+		self.last_action = 0.0
+		self.submitted = 0
+
+	def action(self):
+		"""Call right before a user-visible action."""
+		wait = self.last_action + self.pacer.gap() - time.time()
+		if wait > 0:
+			self.sleep(wait)
+		self.last_action = time.time()
+
+	def start_application(self):
+		return self.pacer.reserve(self.sleep)
+
+	def finish_application(self, slot, submitted):
+		if not submitted:
+			self.pacer.release(slot)
+			return
+		self.submitted += 1
+		if self.pacer.break_every and self.submitted % self.pacer.break_every == 0:
+			sleepTime = random.uniform(*self.pacer.break_seconds)
+			log.info(f'********count_application: {self.submitted}************\n\n')
+			log.info(f"Time for a nap - see you in:{int(sleepTime/60)} min")
+			log.info('****************************************\n\n')
+			self.sleep(sleepTime)
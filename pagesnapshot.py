@@ -0,0 +1,51 @@
+"""Page HTML that is only fetched and parsed when something is read from it."""
+import lxml.html
+
+# class test for one class name among several, as XPath 1.0 has no class selector
+HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+
+def has_class(*names):
+	return " and ".join(HAS_CLASS.format(name) for name in names)
+
+
+class PageSnapshot:
+	"""The HTML of one page, read and parsed with lxml on first use.
+
+	`source` is the HTML, or a callable that returns it, such as
+	`lambda: browser.page_source`; in that case read from the snapshot before
+	the browser navigates away. Pages nobody reads from cost nothing.
+	"""
+
+	def __init__(self, source):
+		self.source = source
+		self._html = None
+		self._tree = None
+
+	@property
+	def html(self):
+		if self._html is None:
+			self._html = self.source() if callable(self.source) else self.source
+		return self._html
+
+	@property
+	def tree(self):
+		if self._tree is None:
+			self._tree = lxml.html.fromstring(self.html or "<html></html>")
+		return self._tree
+
+	def xpath(self, expression, **variables):
+		return self.tree.xpath(expression, **variables)
+
+	def first(self, expression, **variables):
+		found = self.xpath(expression, **variables)
+		return found[0] if found else None
+
+	def exists(self, expression, **variables):
+		return self.first(expression, **variables) is not None
+
+	def links(self, contains=None):
+		"""Every link target on the page, optionally only those containing `contains`."""
+		if contains is None:
+			return self.xpath("//a/@href")
+		return self.xpath("//a[contains(@href, $text)]/@href", text=contains)
@@ -0,0 +1,94 @@
+"""Score job cards against a keyword and resume profile so the best matches are opened first."""
+import logging
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our the to we will with you your
+""".split())
+
+
+def tokenize(text):
+	return [token for token in TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class RelevanceRanker:
+	"""BM25 relevance of job cards to a profile, computed with NumPy for a whole results page at once.
+
+	The query is the profile text plus `keywords`, which count KEYWORD_WEIGHT
+	times; repeated profile terms are damped with log1p. Document
+	frequencies accumulate over every page scored in the run, so the IDF of
+	common title words settles as the run goes on. A card's text is its title,
+	counted TITLE_WEIGHT times, its company and location, and its description
+	when the card carries one.
+	"""
+
+	K1 = 1.2
+	B = 0.75
+	KEYWORD_WEIGHT = 3
+	TITLE_WEIGHT = 2
+
+	def __init__(self, keywords=None, profile=None, threshold=0):
+		counts = Counter(tokenize(profile))
+		for keyword in keywords or []:
+			for token in tokenize(keyword):
+				counts[token] += self.KEYWORD_WEIGHT
+		self.terms = {term: i for i, term in enumerate(sorted(counts))}
+		self.weights = np.log1p(np.array([counts[term] for term in sorted(counts)], dtype=float))
+		self.threshold = threshold or 0
+		self.lock = threading.Lock()
+		self.documents = 0
+		self.document_frequency = np.zeros(len(self.terms))
+		log.info("Ranking jobs against %s profile terms", len(self.terms))
+
+	@classmethod
+	def from_config(cls, config):
+		"""Build a ranker from the `relevance` config, or return None when it is not set."""
+		if not config:
+			return None
+		profile = None
+		if config.get('profile_file'):
+			with open(config['profile_file'], encoding='utf-8') as f:
+				profile = f.read()
+		return cls(config.get('keywords'), profile, config.get('threshold', 0))
+
+	def card_text(self, card):
+		return " ".join([card.get('title') or ""] * self.TITLE_WEIGHT +
+						[card.get('company') or "", card.get('location') or "", card.get('description') or ""])
+
+	def score(self, cards):
+		"""BM25 scores of the cards, in their order."""
+		if not cards or not self.terms:
+			return np.zeros(len(cards))
+		tokens = [tokenize(self.card_text(card)) for card in cards]
+		lengths = np.array([len(doc) for doc in tokens], dtype=float)
+		rows, cols = [], []
+		for row, doc in enumerate(tokens):
+			for token in doc:
+				col = self.terms.get(token)
+				if col is not None:
+					rows.append(row)
+					cols.append(col)
+		tf = np.zeros((len(cards), len(self.terms)))
+		np.add.at(tf, (rows, cols), 1)
+
+		with self.lock:
+			self.documents += len(cards)
+			self.document_frequency += (tf > 0).sum(axis=0)
+			idf = np.log1p((self.documents - self.document_frequency + 0.5) / (self.document_frequency + 0.5))
+		average = lengths.mean() or 1.0
+		saturated = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * lengths[:, None] / average))
+		return saturated @ (idf * self.weights)
+
+	def rank(self, cards):
+		"""Cards scoring at least the threshold, best first, and the rest; both as (score, card) pairs."""
+		scored = sorted(zip(self.score(cards).round(4).tolist(), cards), key=lambda pair: pair[0], reverse=True)
+		keep = [(score, card) for score, card in scored if score >= self.threshold]
+		below = [(score, card) for score, card in scored if score < self.threshold]
+		return keep, below
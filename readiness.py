@@ -0,0 +1,86 @@
+"""Wait for a LinkedIn page to settle instead of scrolling it for a fixed time."""
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# Installs a MutationObserver on first use, nudges lazy-loaded lists by scrolling,
+# and reports everything the readiness check needs in a single round trip.
+PROBE_SCRIPT = """
+var selector = arguments[0], countSelector = arguments[1], step = arguments[2];
+if (!window.__easyApplyObserver) {
+	window.__easyApplyLastMutation = Date.now();
+	window.__easyApplyObserver = new MutationObserver(function () {
+		window.__easyApplyLastMutation = Date.now();
+	});
+	window.__easyApplyObserver.observe(document, {childList: true, subtree: true});
+}
+window.scrollBy(0, step);
+var body = document.body;
+return {
+	state: document.readyState,
+	found: selector ? document.querySelector(selector) !== null : false,
+	count: countSelector ? document.querySelectorAll(countSelector).length : 0,
+	quiet: Date.now() - window.__easyApplyLastMutation,
+	bottom: !body || window.innerHeight + window.scrollY >= body.scrollHeight - 2
+};
+"""
+
+
+def legacy_scroll_time(sleep):
+	"""Seconds the old fixed 0-4000px scroll loop spent on a page for a given step sleep."""
+	return 20 * sleep + (sleep * 3 if sleep != 1 else 0)
+
+
+def wait_until_ready(browser,
+					 selector=None,
+					 count_selector=None,
+					 timeout=15,
+					 quiet=0.75,
+					 poll=0.25,
+					 scroll_step=800,
+					 baseline=None):
+	"""Block until the page is ready and return (seconds waited, reason).
+
+	The page is ready as soon as `selector` is present, or once the document
+	has loaded, the `count_selector` count stopped changing, the DOM has been
+	quiet for `quiet` seconds and the page is scrolled to the bottom. The wait
+	never exceeds `timeout`.
+	"""
+	start = time.time()
+	last_count = None
+	while True:
+		probe = browser.execute_script(PROBE_SCRIPT, selector, count_selector, scroll_step)
+		waited = time.time() - start
+		if probe['state'] == 'complete':
+			if probe['found']:
+				reason = 'selector'
+				break
+			if probe['count'] == last_count and probe['quiet'] >= quiet * 1000 and probe['bottom']:
+				reason = 'quiet'
+				break
+		if waited >= timeout:
+			reason = 'timeout'
+			break
+		last_count = probe['count']
+		time.sleep(poll)
+
+	browser.execute_script("window.scrollTo(0, 0);")
+	if baseline is not None:
+		log.debug("Page ready (%s) after %.1fs, saved %.1fs over the fixed scroll loop",
+				  reason, waited, baseline - waited)
+	return waited, reason
+
+
+# Transfer size and load time of the current document from the Performance API.
+PAGE_STATS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = nav ? nav.transferSize : 0;
+performance.getEntriesByType('resource').forEach(function (entry) { bytes += entry.transferSize || 0; });
+return {bytes: bytes, load: nav && nav.loadEventEnd ? nav.loadEventEnd / 1000 : null};
+"""
+
+
+def page_stats(browser):
+	"""Bytes transferred for the current page so far and its load time in seconds."""
+	return browser.execute_script(PAGE_STATS_SCRIPT)
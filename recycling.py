@@ -0,0 +1,89 @@
+"""Decide when to restart Chrome, and measure how much memory it uses."""
+import logging
+import os
+import time
+
+try:
+	import psutil
+except ImportError:
+	psutil = None
+
+log = logging.getLogger(__name__)
+
+
+def process_tree_rss(pid):
+	"""Resident memory in bytes of a process and all its descendants, or None if it cannot be read.
+
+	Uses psutil when it is installed and /proc otherwise, so without psutil it
+	only works on Linux.
+	"""
+	if psutil is not None:
+		try:
+			root = psutil.Process(pid)
+			processes = [root] + root.children(recursive=True)
+		except psutil.Error:
+			return None
+		total = 0
+		for process in processes:
+			try:
+				total += process.memory_info().rss
+			except psutil.Error:
+				pass
+		return total
+
+	if not os.path.isdir('/proc'):
+		return None
+	children = {}
+	for entry in os.listdir('/proc'):
+		if not entry.isdigit():
+			continue
+		try:
+			with open(f'/proc/{entry}/stat') as f:
+				# the command name is in parentheses and may contain spaces
+				parent = int(f.read().rsplit(')', 1)[1].split()[1])
+		except (OSError, IndexError, ValueError):
+			continue
+		children.setdefault(parent, []).append(int(entry))
+	total, pending = 0, [pid]
+	while pending:
+		current = pending.pop()
+		pending += children.get(current, [])
+		try:
+			with open(f'/proc/{current}/status') as f:
+				for line in f:
+					if line.startswith('VmRSS:'):
+						total += int(line.split()[1]) * 1024
+		except OSError:
+			pass
+	return total
+
+
+def browser_rss(browser):
+	"""Memory of chromedriver and every Chrome process it started."""
+	service = getattr(browser, 'service', None)
+	process = getattr(service, 'process', None)
+	if process is None:
+		return None
+	return process_tree_rss(process.pid)
+
+
+class RecyclePolicy:
+	"""Restart the browser after `jobs` jobs, after `minutes` minutes or above `rss_mb` of memory.
+
+	Any limit left as None is not checked.
+	"""
+
+	def __init__(self, jobs=None, minutes=None, rss_mb=None):
+		self.jobs = jobs
+		self.minutes = minutes
+		self.rss_mb = rss_mb
+
+	def reason(self, jobs, started, rss):
+		"""Why a browser that processed `jobs` jobs since `started` should be restarted, or None."""
+		if self.jobs and jobs >= self.jobs:
+			return f"{jobs} jobs"
+		if self.minutes and time.time() - started >= self.minutes * 60:
+			return f"{(time.time() - started) / 60:.0f} minutes"
+		if self.rss_mb and rss is not None and rss >= self.rss_mb * 1024 * 1024:
+			return f"{rss / 1024 / 1024:.0f} MB"
+		return None
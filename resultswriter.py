@@ -0,0 +1,143 @@
+"""Write result rows from a background thread in batches, rotating the CSV files."""
+import atexit
+import csv
+import glob
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+COLUMNS = ['timestamp', 'jobID', 'job', 'company', 'attempted', 'result', 'failure', 'score']
+JOB_PATTERN = re.compile(r"\(?\d?\)?\s?(\w.*)")
+COMPANY_PATTERN = re.compile(r"(\w.*)")
+
+
+def split_title(title):
+	"""Job and company from a job page title such as "(3) Data Engineer | Acme | LinkedIn"."""
+	parts = title.split(' | ')
+	job = JOB_PATTERN.search(parts[0])
+	company = COMPANY_PATTERN.search(parts[1]) if len(parts) > 1 else None
+	return job.group(1) if job else None, company.group(1) if company else None
+
+
+def result_row(timestamp, jobID, title, attempted, result, failure=None, score=None):
+	return [timestamp, jobID, *split_title(title), attempted, result, failure, score]
+
+
+class ResultsWriter:
+	"""Queue rows and append them to a CSV from a background thread.
+
+	A batch is written when `flush_rows` rows are waiting or `flush_seconds`
+	have passed, and on `close`, which also runs at interpreter exit. Before a
+	batch is written the file is rotated to `<name>-<date>.csv` when it is
+	larger than `max_bytes` or, with `rotate_daily`, was last written on an
+	earlier day. `format_row`, if given, turns a queued item into a row on
+	the writer thread.
+	"""
+
+	def __init__(self, filename, flush_rows=20, flush_seconds=5, max_bytes=None, rotate_daily=False,
+				 format_row=None):
+		self.filename = filename
+		self.flush_rows = flush_rows
+		self.flush_seconds = flush_seconds
+		self.max_bytes = max_bytes
+		self.rotate_daily = rotate_daily
+		self.format_row = format_row
+		self.rows = queue.Queue()
+		self.closed = False
+		self.thread = threading.Thread(target=self.run, name='results-writer', daemon=True)
+		self.thread.start()
+		atexit.register(self.close)
+
+	def write(self, *item):
+		self.rows.put(item)
+
+	def run(self):
+		batch = []
+		deadline = time.time() + self.flush_seconds
+		while True:
+			try:
+				item = self.rows.get(timeout=max(deadline - time.time(), 0))
+			except queue.Empty:
+				item = ()
+			if item is None:
+				self.flush(batch)
+				return
+			if item:
+				batch.append(self.format_row(*item) if self.format_row else list(item))
+			if len(batch) >= self.flush_rows or time.time() >= deadline:
+				self.flush(batch)
+				batch = []
+				deadline = time.time() + self.flush_seconds
+
+	def flush(self, batch):
+		if not batch:
+			return
+		try:
+			self.rotate()
+			with open(self.filename, 'a', newline='', encoding='utf-8') as f:
+				csv.writer(f).writerows(batch)
+		except OSError:
+			log.exception("Could not write %s rows to %s", len(batch), self.filename)
+
+	def rotate(self):
+		try:
+			stat = os.stat(self.filename)
+		except FileNotFoundError:
+			return
+		too_big = self.max_bytes and stat.st_size >= self.max_bytes
+		new_day = self.rotate_daily and datetime.fromtimestamp(stat.st_mtime).date() < datetime.now().date()
+		if not (too_big or new_day):
+			return
+		base, ext = os.path.splitext(self.filename)
+		rotated = f"{base}-{datetime.now():%Y%m%d-%H%M%S}{ext}"
+		n = 1
+		while os.path.exists(rotated):
+			rotated = f"{base}-{datetime.now():%Y%m%d-%H%M%S}-{n}{ext}"
+			n += 1
+		os.replace(self.filename, rotated)
+		log.info("Rotated %s to %s", self.filename, rotated)
+
+	def close(self):
+		"""Write everything still queued and stop the writer thread."""
+		if self.closed:
+			return
+		self.closed = True
+		self.rows.put(None)
+		self.thread.join()
+		atexit.unregister(self.close)
+
+
+def history_files(filename):
+	"""The current output CSV and every file rotated from it, oldest first."""
+	base, ext = os.path.splitext(filename)
+	rotated = sorted(glob.glob(glob.escape(base) + '-[0-9]*' + ext), key=os.path.getmtime)
+	return rotated + ([filename] if os.path.isfile(filename) else [])
+
+
+def export_parquet(filename, parquet_file):
+	"""Combine the output CSV and its rotated files into one Parquet file; needs pandas and pyarrow."""
+	import pandas as pd
+
+	frames = [pd.read_csv(path, names=COLUMNS, header=None, parse_dates=['timestamp'])
+			  for path in history_files(filename)]
+	history = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+	history.to_parquet(parquet_file, index=False)
+	log.info("Exported %s rows from %s files to %s", len(history), len(frames), parquet_file)
+	return len(history)
+
+
+if __name__ == '__main__':
+	logging.basicConfig(level=logging.INFO)
+	if len(sys.argv) != 3:
+		sys.exit("usage: python3 resultswriter.py OUTPUT_CSV PARQUET_FILE")
+	try:
+		export_parquet(sys.argv[1], sys.argv[2])
+	except ImportError as e:
+		sys.exit(f"Parquet export needs pandas and pyarrow: {e}")
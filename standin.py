@@ -0,0 +1,224 @@
+"""Local stand-in for the LinkedIn pages the bot drives, for offline benchmarks.
+
+Serves a login page, search results with `data-job-id` cards, job pages with
+a `jobs-apply` button and a multi-step Easy Apply modal using the same
+aria-labels `send_resume` looks for. Every page but the login page needs the
+session cookie set by logging in. Run it on its own with
+
+	python standin.py --port 8000
+"""
+import argparse
+import html
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# bound at import, so the benchmark's scaling of time.sleep does not shorten the latency
+from time import sleep
+from urllib.parse import parse_qs, urlparse
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}</body></html>
+"""
+
+LOGIN = """
+<form method="post" action="/login">
+	<input id="username" name="session_key" type="text">
+	<input id="password" name="session_password" type="password">
+	<button class="btn__primary--large" type="submit">Sign in</button>
+</form>
+"""
+
+CARD = """
+<div class="job-card-container" data-job-id="urn:li:fs_normalized_jobPosting:{jobID}">
+	<a class="job-card-list__title" data-control-name="job_card_title" href="/jobs/view/{jobID}/">{title}</a>
+	<a class="job-card-container__company-name" data-control-name="job_card_company_link" href="/company/{jobID}/">{company}</a>
+	<ul><li class="job-card-container__metadata-item">{location}</li></ul>
+	{badge}
+</div>
+"""
+
+JOB = """
+<h1>{title}</h1>
+<p>{company} &middot; {location}</p>
+{button}
+<div class="jobs-description">{description}</div>
+<div id="modal"></div>
+<script>
+var jobID = {jobID};
+var step = 0;
+var steps = [
+	'<h3>Contact info</h3>' +
+	'<button aria-label="Continue to next step" onclick="advance()">Next</button>',
+
+	'<h3>Additional questions</h3>' +
+	'<div class="jobs-easy-apply-form-section__grouping"><span>Are you legally authorized to work in the United States?</span>' +
+	'<label><input type="radio" name="authorized" value="Yes">Yes</label>' +
+	'<label><input type="radio" name="authorized" value="No">No</label></div>' +
+	'<div class="jobs-easy-apply-form-section__grouping"><span>How many years of work experience do you have with Python?</span>' +
+	'<input type="text" name="years"></div>' +
+	'<div id="errors"></div>' +
+	'<button aria-label="Review your application" onclick="review()">Review</button>',
+
+	'<h3>Review your application</h3>' +
+	'<button aria-label="Submit application" onclick="submitApplication()">Submit application</button>',
+
+	'<h3>Your application was sent</h3>' +
+	'<button aria-label="Dismiss" onclick="dismiss()">Done</button>'
+];
+function render() {{ document.getElementById('modal').innerHTML = '<div role="dialog">' + steps[step] + '</div>'; }}
+function openModal() {{ step = 0; render(); }}
+function advance() {{ step += 1; render(); }}
+function review() {{
+	var answered = document.querySelector('input[name="authorized"]:checked') &&
+		document.querySelector('input[name="years"]').value.trim() !== '';
+	if (answered) {{ advance(); return; }}
+	document.getElementById('errors').innerHTML =
+		'<p data-test-form-element-error-message="true">Please enter a valid answer</p>';
+}}
+function submitApplication() {{
+	fetch('/api/apply/' + jobID, {{method: 'POST'}}).then(advance);
+}}
+function dismiss() {{ document.getElementById('modal').innerHTML = ''; }}
+</script>
+"""
+
+EASY_APPLY_BUTTON = """<button class="jobs-apply-button artdeco-button" onclick="openModal()"><span>Easy Apply</span></button>"""
+
+TITLES = ["Data Scientist", "Machine Learning Engineer", "Data Analyst", "Software Engineer", "Research Scientist"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne"]
+
+
+class StandIn:
+	"""Deterministic job data plus counters of what the bot did."""
+
+	def __init__(self, jobs_per_search=50, easy_apply_every=4, latency=0.0):
+		self.jobs_per_search = jobs_per_search
+		self.easy_apply_every = easy_apply_every
+		self.latency = latency
+		self.lock = threading.Lock()
+		self.requests = 0
+		self.applications = []
+
+	def search_ids(self, keywords, location):
+		base = zlib.crc32(f"{keywords}|{location}".encode()) % 10 ** 6 * 1000 + 10 ** 9
+		return [base + i for i in range(self.jobs_per_search)]
+
+	def job(self, jobID):
+		return {
+			'jobID': jobID,
+			'title': TITLES[jobID % len(TITLES)],
+			'company': COMPANIES[jobID // 7 % len(COMPANIES)],
+			'location': "Remote",
+			'easyApply': jobID % self.easy_apply_every != 0,
+			'description': "Python, SQL and statistics. " * 20,
+		}
+
+
+class Handler(BaseHTTPRequestHandler):
+	standin = None
+
+	def log_message(self, format, *args):
+		pass
+
+	def send_page(self, title, body, status=200, headers=None):
+		content = PAGE.format(title=html.escape(title), body=body).encode('utf-8')
+		self.send_response(status)
+		self.send_header("Content-Type", "text/html; charset=utf-8")
+		self.send_header("Content-Length", str(len(content)))
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		self.end_headers()
+		self.wfile.write(content)
+
+	def redirect(self, location, headers=None):
+		self.send_response(303)
+		self.send_header("Location", location)
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		self.send_header("Content-Length", "0")
+		self.end_headers()
+
+	def count(self):
+		with self.standin.lock:
+			self.standin.requests += 1
+		if self.standin.latency:
+			sleep(self.standin.latency)
+
+	def logged_in(self):
+		return "li_at=" in (self.headers.get("Cookie") or "")
+
+	def do_GET(self):
+		self.count()
+		url = urlparse(self.path)
+		query = {key: values[0] for key, values in parse_qs(url.query).items()}
+		if url.path == "/login":
+			self.send_page("LinkedIn Login, Sign in | LinkedIn", LOGIN)
+		elif not self.logged_in():
+			self.redirect("/login")
+		elif url.path.startswith("/feed"):
+			self.send_page("Feed | LinkedIn", "<h1>Feed</h1>")
+		elif url.path.startswith("/jobs/search"):
+			self.search(query)
+		elif url.path.startswith("/jobs/view/"):
+			self.job_page(url.path.strip("/").split("/")[-1])
+		else:
+			self.send_page("Page not found | LinkedIn", "<h1>Not found</h1>", status=404)
+
+	def do_POST(self):
+		self.count()
+		length = int(self.headers.get("Content-Length") or 0)
+		self.rfile.read(length)
+		if self.path == "/login":
+			self.redirect("/feed/", {"Set-Cookie": "li_at=standin; Path=/"})
+		elif self.path.startswith("/api/apply/"):
+			with self.standin.lock:
+				self.standin.applications.append(int(self.path.rsplit("/", 1)[-1]))
+			self.send_response(204)
+			self.end_headers()
+		else:
+			self.send_response(404)
+			self.end_headers()
+
+	def search(self, query):
+		start = int(query.get("start", 0))
+		ids = self.standin.search_ids(query.get("keywords", ""), query.get("location", ""))[start:start + 25]
+		cards = []
+		for jobID in ids:
+			job = self.standin.job(jobID)
+			badge = '<span class="job-card-container__apply-method">Easy Apply</span>' if job['easyApply'] else ''
+			cards.append(CARD.format(badge=badge, **{k: html.escape(str(v)) for k, v in job.items()}))
+		self.send_page(f"{query.get('keywords', '')} Jobs | LinkedIn", "<ul>" + "".join(cards) + "</ul>")
+
+	def job_page(self, jobID):
+		try:
+			job = self.standin.job(int(jobID))
+		except ValueError:
+			self.send_page("Page not found | LinkedIn", "<h1>Not found</h1>", status=404)
+			return
+		button = EASY_APPLY_BUTTON if job['easyApply'] else '<a class="apply-externally" href="#">Apply</a>'
+		fields = {k: html.escape(str(v)) for k, v in job.items()}
+		self.send_page(f"{job['title']} | {job['company']} | LinkedIn", JOB.format(button=button, **fields))
+
+
+def serve(standin, host="127.0.0.1", port=0):
+	"""Start the stand-in in a daemon thread and return the running server."""
+	handler = type("StandInHandler", (Handler,), {'standin': standin})
+	server = ThreadingHTTPServer((host, port), handler)
+	threading.Thread(target=server.serve_forever, name="standin", daemon=True).start()
+	return server
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--port", type=int, default=8000)
+	parser.add_argument("--jobs", type=int, default=50, help="jobs returned per search")
+	parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+	args = parser.parse_args()
+
+	server = serve(StandIn(args.jobs, latency=args.latency), port=args.port)
+	print(f"Stand-in running on http://127.0.0.1:{server.server_port}")
+	try:
+		threading.Event().wait()
+	except KeyboardInterrupt:
+		server.shutdown()
@@ -0,0 +1,106 @@
+"""Check the configured upload files once, and attach them to Easy Apply file inputs."""
+import hashlib
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+MAX_BYTES = 2 * 1024 * 1024
+# leading bytes of each accepted format
+SIGNATURES = {
+	'.pdf': [b'%PDF'],
+	'.docx': [b'PK\x03\x04'],
+	'.doc': [b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'],
+	'.jpg': [b'\xff\xd8\xff'],
+	'.jpeg': [b'\xff\xd8\xff'],
+	'.png': [b'\x89PNG\r\n\x1a\n'],
+}
+
+# Every file input in the modal with the text around it and the documents already attached to it.
+INPUTS_SCRIPT = """
+var dialog = document.querySelector('div[role="dialog"], .jobs-easy-apply-modal') || document;
+return Array.from(dialog.querySelectorAll('input[type="file"]')).map(function (input) {
+	var section = input.parentElement;
+	// widen to the enclosing section, but never to one holding another file input
+	for (var i = 0; i < 4; i++) {
+		var parent = section.parentElement;
+		if (!parent || parent === dialog || parent.querySelectorAll('input[type="file"]').length > 1) {
+			break;
+		}
+		section = parent;
+	}
+	var attached = Array.from(section.querySelectorAll('[class*="file-name"], [class*="document-title"]'))
+		.map(function (el) { return el.innerText.trim(); });
+	Array.from(input.files || []).forEach(function (file) { attached.push(file.name); });
+	return {input: input, label: section.innerText, attached: attached};
+});
+"""
+
+
+class Upload:
+	"""A file from the `uploads` config with the facts checked at startup."""
+
+	def __init__(self, name, path):
+		self.name = name
+		self.path = os.path.abspath(os.path.expanduser(path))
+		self.filename = os.path.basename(self.path)
+		self.format = os.path.splitext(self.path)[1].lower()
+		self.size = os.path.getsize(self.path)
+		with open(self.path, 'rb') as f:
+			content = f.read()
+		self.sha256 = hashlib.sha256(content).hexdigest()
+		self.header = content[:8]
+
+	def problems(self):
+		if self.format not in SIGNATURES:
+			return [f"{self.filename} is not one of {', '.join(sorted(SIGNATURES))}"]
+		found = []
+		if not any(self.header.startswith(signature) for signature in SIGNATURES[self.format]):
+			found.append(f"{self.filename} does not look like a {self.format} file")
+		if self.size > MAX_BYTES:
+			found.append(f"{self.filename} is {self.size / 1024 / 1024:.1f} MB, LinkedIn accepts up to 2 MB")
+		if self.size == 0:
+			found.append(f"{self.filename} is empty")
+		return found
+
+
+def check_uploads(uploads):
+	"""Turn the `uploads` mapping of names to paths into Upload objects, or raise ValueError listing every problem."""
+	checked, problems = {}, []
+	for name, path in (uploads or {}).items():
+		if isinstance(path, Upload):
+			checked[name] = path
+			continue
+		if not path:
+			problems.append(f"{name}: no path given")
+			continue
+		try:
+			upload = Upload(name, path)
+		except OSError as e:
+			problems.append(f"{name}: {e}")
+			continue
+		problems += [f"{name}: {problem}" for problem in upload.problems()]
+		checked[name] = upload
+		log.info("Upload %s: %s, %s bytes, sha256 %s", name, upload.path, upload.size, upload.sha256[:12])
+	if problems:
+		raise ValueError("Invalid uploads:\n" + "\n".join(problems))
+	return checked
+
+
+def file_inputs(browser):
+	return browser.execute_script(INPUTS_SCRIPT)
+
+
+def match_upload(field, uploads):
+	"""The upload whose name appears in the text around a file input.
+
+	An input that matches no name but takes documents gets the resume, since
+	LinkedIn's resume step often only names the formats it accepts.
+	"""
+	label = field['label'].lower()
+	for name, upload in uploads.items():
+		if name.lower() in label:
+			return upload
+	if 'Resume' in uploads and ('pdf' in label or 'doc' in label):
+		return uploads['Resume']
+	return None